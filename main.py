@@ -1,8 +1,9 @@
+import os
 import sys
+import random
 from os.path import join as path_join
 
 import pygame
-from pytmx.util_pygame import load_pygame
 
 from src.settings import settings
 from src.level import Level
@@ -10,12 +11,33 @@ from src.utilities import utilities
 from src.data import Data
 from src.ui import UI
 from src.overworld import OverWorld
+from src.timer import scheduler, VirtualClock
+from src.animation import animation_clocks
+from src.maps import Maps
 
 
 class Game:
     """The entire game's class"""
-    def __init__(self):
-        """Create the game"""
+    def __init__(self, headless=False, seed=None):
+        """Create the game, a headless one runs on a virtual clock without a window or sound,
+        the seed makes the random choices repeat"""
+        # Set the seed of the random choices if it was given
+        if seed is not None:
+            random.seed(seed)
+
+        # If the game is headless, use the dummy video and audio drivers, and move the time only when simulating
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            self.virtual_clock = VirtualClock()
+        # Otherwise use the real time
+        else:
+            self.virtual_clock = None
+
+        # Start without the timers and the animations of an earlier game, on the clock of this one
+        scheduler.reset(self.virtual_clock or pygame.time.get_ticks)
+        animation_clocks.reset()
+
         # Initialize pygame
         pygame.init()
 
@@ -36,15 +58,16 @@ class Game:
         # Data of the game
         self.data = Data(self.ui)
 
-        # Load the maps
-        self.maps = {
-            0: load_pygame(path_join(settings.BASE_PATH, "../data/levels/0.tmx")),
-            1: load_pygame(path_join(settings.BASE_PATH, "../data/levels/1.tmx")),
-            2: load_pygame(path_join(settings.BASE_PATH, "../data/levels/2.tmx")),
-            3: load_pygame(path_join(settings.BASE_PATH, "../data/levels/3.tmx")),
-            4: load_pygame(path_join(settings.BASE_PATH, "../data/levels/4.tmx")),
-            5: load_pygame(path_join(settings.BASE_PATH, "../data/levels/5.tmx"))
-        }
+        # Prepare the maps of levels and the overworld, they are loaded when they are needed
+        self.maps = Maps({
+            0: path_join(settings.BASE_PATH, "../data/levels/0.tmx"),
+            1: path_join(settings.BASE_PATH, "../data/levels/1.tmx"),
+            2: path_join(settings.BASE_PATH, "../data/levels/2.tmx"),
+            3: path_join(settings.BASE_PATH, "../data/levels/3.tmx"),
+            4: path_join(settings.BASE_PATH, "../data/levels/4.tmx"),
+            5: path_join(settings.BASE_PATH, "../data/levels/5.tmx"),
+            "overworld": path_join(settings.BASE_PATH, "../data/overworld/overworld.tmx")
+        })
 
         # Load the sounds
         self.sounds = {
@@ -55,20 +78,29 @@ class Game:
             "jump": pygame.mixer.Sound(path_join(settings.BASE_PATH, "../audio/jump.wav")),
         }
 
-        # Load the over-world map
-        self.overworld_map = load_pygame(path_join(settings.BASE_PATH, "../data/overworld/overworld.tmx"))
+        # Level that the overworld prefetched, and the baker of its static tiles, baked a little every frame
+        self.preparing = None
+        self.baker = None
 
         # Current level
-        self.current_level = Level(self.maps[self.data.level], self.level_frames, self.data, self._switch_level,
+        self.current_level = Level(self.maps.get(self.data.level), self.level_frames, self.data, self._switch_level,
                                    self.sounds)
-        # self.current_level = OverWorld(self.overworld_map, self.data, self.overworld_frames)
+        # self.current_level = OverWorld(self.maps.get("overworld"), self.data, self.overworld_frames,
+        #                                self._switch_level, self._prefetch)
 
     def run(self):
         """Run the game"""
+        # Delta time of a singular simulation step
+        step = 1 / settings.SIMULATION_RATE
+        # Time that passed, but wasn't simulated yet
+        accumulator = 0
+
         # Game loop
         while True:
-            # Remain the FPS at 60, save the delta time as milliseconds
-            delta_time = self.timer.tick(60) / 1000
+            # Limit the FPS, save the frame time in seconds
+            delta_time = self.timer.tick(settings.FPS) / 1000
+            # Add it to the time to simulate, but not too much of it after a hitch
+            accumulator += min(delta_time, settings.MAX_FRAME_TIME)
 
             # Handle events
             self._get_events()
@@ -76,12 +108,69 @@ class Game:
             # Check for game over and handle it
             self._game_over()
 
-            # Run the level
-            self.current_level.run(delta_time)
+            # Update the level in steps of the same length, until there isn't enough time left for one
+            while accumulator >= step:
+                self._step(step)
+                accumulator -= step
+
+            # Draw the level in between the last two steps, based off the time left
+            self.current_level.draw(accumulator / step, delta_time)
 
             # Update display
             self._update_surface(delta_time)
 
+            # Use the rest of the frame to prepare the next level
+            self._prepare()
+
+    def simulate(self, duration):
+        """Simulate the game for the duration in seconds as fast as possible, without drawing it,
+        return False if it ended with a game over"""
+        # Delta time of a singular simulation step
+        step = 1 / settings.SIMULATION_RATE
+
+        # Simulate every step of the duration
+        for step_num in range(round(duration * settings.SIMULATION_RATE)):
+            # Throw away the events, so the system doesn't think that the game froze
+            pygame.event.pump()
+
+            # Stop if the player doesn't have any health left
+            if self.data.health <= 0:
+                return False
+
+            self._step(step)
+
+        return self.data.health > 0
+
+    def _step(self, delta_time):
+        """Update the game by a singular simulation step"""
+        # If the game runs on a virtual clock, move it
+        if self.virtual_clock:
+            self.virtual_clock.advance(delta_time)
+
+        # Expire the timers that are due, then update the level
+        scheduler.update()
+        self.current_level.update(delta_time)
+
+    def _prefetch(self, level):
+        """Start loading the level's map in the background, and prepare the level when it's loaded"""
+        self.maps.prefetch(level)
+
+        # If it's a different level, forget the tiles baked for the previous one
+        if level != self.preparing:
+            self.preparing = level
+            self.baker = None
+
+    def _prepare(self):
+        """Bake a part of the prefetched level's static tiles, once its map is loaded"""
+        # If no level is prefetched or its map is still loading, there is nothing to do
+        if self.preparing is None or not self.maps.loaded(self.preparing):
+            return
+
+        # Start baking the tiles, continue it for a moment
+        if self.baker is None:
+            self.baker = Level.bake_tiles(self.maps.get(self.preparing))
+        self.baker.bake(settings.PREPARE_TIME)
+
     def _get_events(self):
         """Get and handle the game's events"""
         # Grab all the events
@@ -105,8 +194,13 @@ class Game:
         """Switch between the level and the overworld"""
         # If target is level, let the player go to it
         if target == "level":
-            self.current_level = Level(self.maps[self.data.level], self.level_frames, self.data,
-                                       self._switch_level, self.sounds)
+            # Use the tiles that were prepared for this level
+            tiles = self.baker if self.preparing == self.data.level else None
+            self.preparing = None
+            self.baker = None
+
+            self.current_level = Level(self.maps.get(self.data.level), self.level_frames, self.data,
+                                       self._switch_level, self.sounds, tiles)
 
         # If target is overworld, go to it
         else:
@@ -118,8 +212,8 @@ class Game:
                 self.data.health -= 1
 
             # Go to the overworld
-            self.current_level = OverWorld(self.overworld_map, self.data, self.overworld_frames,
-                                           self._switch_level)
+            self.current_level = OverWorld(self.maps.get("overworld"), self.data, self.overworld_frames,
+                                           self._switch_level, self._prefetch)
 
     def _game_over(self):
         """Check and handle game over"""
@@ -0,0 +1,47 @@
+class AnimationClock:
+    """Clock that animates every sprite with the same frames and speed at once"""
+    def __init__(self, frames, speed):
+        """Initialize the clock"""
+        # Animation frames and their speed
+        self.frames = frames
+        self.speed = speed
+
+        # Current frame
+        self.frame = 0
+
+    def update(self, delta_time):
+        """Move the animation forward"""
+        self.frame = (self.frame + self.speed * delta_time) % len(self.frames)
+
+    def get_image(self, phase=0):
+        """Get the current image, moved by the phase (in frames)"""
+        return self.frames[int(self.frame + phase) % len(self.frames)]
+
+
+class AnimationClocks:
+    """Clocks shared by the animated sprites"""
+    def __init__(self):
+        """Prepare the clocks"""
+        # Clocks stored by their frames and speed
+        self.clocks = {}
+
+    def get(self, frames, speed):
+        """Get the clock of the frames and speed, create it if there isn't one yet"""
+        key = (tuple(frames), speed)
+        if key not in self.clocks:
+            self.clocks[key] = AnimationClock(frames, speed)
+
+        return self.clocks[key]
+
+    def reset(self):
+        """Throw away every clock, for a new game"""
+        self.clocks = {}
+
+    def update(self, delta_time):
+        """Move every clock forward"""
+        for clock in self.clocks.values():
+            clock.update(delta_time)
+
+
+# Instantiate the clocks
+animation_clocks = AnimationClocks()
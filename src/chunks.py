@@ -0,0 +1,103 @@
+import math
+from time import perf_counter
+from collections import deque
+
+import pygame
+
+from src.settings import settings
+from src.utilities import utilities
+from src.animation import animation_clocks
+
+
+class TileChunks:
+    """Static tiles of a single depth layer, baked into bigger chunk surfaces"""
+    def __init__(self, width, height, chunk_size=settings.CHUNK_SIZE):
+        """Prepare the chunks of a level with the given dimensions in pixels"""
+        # Size of a singular chunk in pixels
+        self.size = chunk_size * settings.TILE_SIZE
+        # Dimensions of the level, chunks on its edges are cut to them
+        self.width = width
+        self.height = height
+
+        # Chunk surfaces, stored by their grid position
+        self.chunks = {}
+
+    def bake(self, chunk, blits):
+        """Bake the tile surfaces into the chunk, at their positions relative to it"""
+        # Create the chunk if it doesn't exist yet, don't let it go past the level
+        if chunk not in self.chunks:
+            self.chunks[chunk] = pygame.Surface((min(self.size, self.width - chunk[0] * self.size),
+                                                 min(self.size, self.height - chunk[1] * self.size)), pygame.SRCALPHA)
+
+        # Blit all the tiles into it at once
+        self.chunks[chunk].fblits(blits)
+
+    def draw(self, surface, offset):
+        """Draw the chunks that are visible with the given camera offset"""
+        # Calculate the first and the last visible column and row
+        left = int(-offset.x // self.size)
+        right = int((-offset.x + settings.WINDOW_WIDTH) // self.size)
+        top = int(-offset.y // self.size)
+        bottom = int((-offset.y + settings.WINDOW_HEIGHT) // self.size)
+
+        # Get each visible chunk that exists and its position on the screen
+        blits = [(self.chunks[(column, row)], (column * self.size + offset.x, row * self.size + offset.y))
+                 for column in range(left, right + 1) for row in range(top, bottom + 1)
+                 if (column, row) in self.chunks]
+        # Blit them all at once
+        surface.fblits(blits)
+
+
+class TileBaker:
+    """Bakes the tile layers of a compiled map into chunks of their depths, a few chunks at a time,
+    so the baking can be spread over several frames"""
+    def __init__(self, level_map, layers):
+        """Prepare the baking of the layers, given as their names and depths"""
+        # Chunks of each depth, and the dimensions of the level in pixels
+        self.chunks = {}
+        width = level_map.width * settings.TILE_SIZE
+        height = level_map.height * settings.TILE_SIZE
+
+        # Chunks that aren't baked yet, with the chunks of their depth and the layer of their tiles, in order
+        self.waiting = deque()
+        for name, depth in layers:
+            layer = level_map.get_layer_by_name(name)
+            self.chunks.setdefault(depth, TileChunks(width, height))
+            self.waiting.extend((self.chunks[depth], layer, chunk) for chunk in layer.chunk_tiles)
+
+    def bake(self, duration=None):
+        """Bake the waiting chunks for about the duration in seconds (or all of them if it isn't given),
+        return True if everything is baked"""
+        # Calculate when to stop, there is always at least one chunk baked
+        end_time = perf_counter() + duration if duration is not None else None
+
+        # Bake the chunks in order, until the time ends
+        while self.waiting:
+            chunks, layer, chunk = self.waiting.popleft()
+            chunks.bake(chunk, layer.get_blits(chunk))
+
+            if end_time is not None and perf_counter() >= end_time:
+                break
+
+        return not self.waiting
+
+
+class TiledPlane:
+    """Animated tile repeated over the entire camera view, drawn with a wrapped offset"""
+    def __init__(self, frames, animation_speed=8):
+        """Prepare the plane"""
+        # Size of a singular tile
+        self.tile_width, self.tile_height = frames[0].get_size()
+
+        # Size of the plane, it covers the camera view even when moved by almost one tile
+        width = (math.ceil(settings.WINDOW_WIDTH / self.tile_width) + 1) * self.tile_width
+        height = (math.ceil(settings.WINDOW_HEIGHT / self.tile_height) + 1) * self.tile_height
+
+        # Every frame repeated over the plane, animated by a shared clock
+        self.frames = [utilities.tile(frame, width, height) for frame in frames]
+        self.clock = animation_clocks.get(self.frames, animation_speed)
+
+    def draw(self, surface, offset):
+        """Draw the current frame of the plane, moved with the camera offset"""
+        surface.blit(self.clock.get_image(), (offset.x % self.tile_width - self.tile_width,
+                                              offset.y % self.tile_height - self.tile_height))
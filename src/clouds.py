@@ -0,0 +1,94 @@
+import random
+
+from src.settings import settings
+
+
+class CloudField:
+    """Small clouds floating through the sky, stored in lists instead of separate sprites"""
+    def __init__(self, surfaces, level_width, top, bottom):
+        """Create the cloud field"""
+        # Cloud surfaces to choose from
+        self.surfaces = surfaces
+
+        # Width of the level, and the vertical range in which clouds appear
+        self.level_width = level_width
+        self.top = top
+        self.bottom = bottom
+
+        # Horizontal positions of the clouds, and their positions from before the last simulation step
+        self.pos_x = []
+        self.last_x = []
+        # Vertical positions, speeds, widths and surface indexes of the clouds
+        self.pos_y = []
+        self.speeds = []
+        self.widths = []
+        self.kinds = []
+
+        # Indexes of clouds that left the level, they are used again by the new ones
+        self.free = []
+
+        # Create a cloud every 2,5 seconds, save the time since the last one
+        self.spawn_delay = 2.5
+        self.spawn_time = 0
+
+        # Create 15 small clouds at the start
+        for cloud_num in range(15):
+            self._spawn(random.randint(0, self.level_width))
+
+    def update(self, delta_time):
+        """Move all clouds and create a new one if it's time"""
+        # Create a cloud behind the right side of the level when enough time passed
+        self.spawn_time += delta_time
+        if self.spawn_time >= self.spawn_delay:
+            self.spawn_time -= self.spawn_delay
+            self._spawn(random.randint(self.level_width + 450, self.level_width + 600))
+
+        # Move every cloud to the left at once
+        self.last_x = self.pos_x
+        self.pos_x = [pos_x - speed * delta_time for pos_x, speed in zip(self.pos_x, self.speeds)]
+
+        # Stop the clouds that went behind the left border, let the new ones use them
+        for index, (pos_x, width, speed) in enumerate(zip(self.pos_x, self.widths, self.speeds)):
+            if pos_x + width <= 0 and speed:
+                self.speeds[index] = 0
+                self.free.append(index)
+
+    def draw(self, surface, offset, alpha=1):
+        """Draw the visible clouds in between the last two simulation steps"""
+        blits = []
+        # Go through each cloud, get its position on the screen
+        for pos_x, last_x, pos_y, width, kind in zip(self.pos_x, self.last_x, self.pos_y, self.widths, self.kinds):
+            screen_x = last_x + (pos_x - last_x) * alpha + offset.x
+            # Save it if it's visible
+            if -width < screen_x < settings.WINDOW_WIDTH:
+                blits.append((self.surfaces[kind], (screen_x, pos_y + offset.y)))
+
+        # Blit them all at once
+        surface.fblits(blits)
+
+    def _spawn(self, center_x):
+        """Create a cloud with its bottom center in the given horizontal and a random vertical position"""
+        # Choose a random surface, get its position and speed
+        kind = random.randrange(len(self.surfaces))
+        width, height = self.surfaces[kind].get_size()
+        pos_x = center_x - width / 2
+        pos_y = random.randint(self.top, self.bottom) - height
+        speed = random.randint(50, 120)
+
+        # If there is a free cloud, use it
+        if self.free:
+            index = self.free.pop()
+            self.pos_x[index] = self.last_x[index] = pos_x
+            self.pos_y[index] = pos_y
+            self.speeds[index] = speed
+            self.widths[index] = width
+            self.kinds[index] = kind
+
+        # Otherwise add a new one
+        else:
+            self.pos_x.append(pos_x)
+            self.last_x.append(pos_x)
+            self.pos_y.append(pos_y)
+            self.speeds.append(speed)
+            self.widths.append(width)
+            self.kinds.append(kind)
@@ -0,0 +1,561 @@
+import os
+import sys
+import json
+import zlib
+import struct
+import hashlib
+from time import perf_counter
+from array import array
+from collections import namedtuple
+from xml.etree import ElementTree
+
+import pygame
+
+from src.settings import settings
+
+
+# Version of the compiled format, files of other versions are compiled again
+FORMAT_VERSION = 4
+
+# Start of a compiled file, the magic bytes and the format version, the rest of the file is compressed
+PREFIX = struct.Struct("<4sI")
+MAGIC = b"LVL\0"
+# Length of the JSON header, at the start of the compressed part, the arrays of the tile layers follow it
+HEADER = struct.Struct("<I")
+
+# Flags stored in the highest bits of tile ids, and the mask that removes them
+FLIP_X = 1 << 31
+FLIP_Y = 1 << 30
+FLIP_DIAGONAL = 1 << 29
+GID_MASK = ~(FLIP_X | FLIP_Y | FLIP_DIAGONAL) & 0xFFFFFFFF
+
+# Tile layer whose tiles are solid, its collision grid is compiled with the map
+COLLISION_LAYER = "Terrain"
+
+# Point of a polygon or a polyline object
+Point = namedtuple("Point", "x y")
+
+# Images of the tilesets, shared by every map
+tileset_images = {}
+# Parsed tileset files stored by their paths and hashes, most maps use the same ones
+tileset_elements = {}
+
+
+def compile_map(path):
+    """Compile the TMX map and the TSX tilesets it uses into data that can be saved and loaded quickly"""
+    # Directory of the map, paths in the compiled data are relative to it
+    directory = os.path.dirname(path)
+    # Get the map element
+    root = ElementTree.parse(path).getroot()
+
+    # Hashes of the files that the map is compiled from, so it can be compiled again when any of them changes
+    sources = {os.path.basename(path): _hash(path)}
+
+    # Go through each tileset, read the external ones from their files
+    tilesets = []
+    for element in root.findall("tileset"):
+        first_gid = int(element.get("firstgid"))
+        base = directory
+        if element.get("source"):
+            tileset_path = os.path.normpath(os.path.join(directory, element.get("source")))
+            sources[element.get("source")] = tileset_hash = _hash(tileset_path)
+            base = os.path.dirname(tileset_path)
+
+            # Parse the tileset file only if it wasn't parsed already
+            if (tileset_path, tileset_hash) not in tileset_elements:
+                tileset_elements[tileset_path, tileset_hash] = ElementTree.parse(tileset_path).getroot()
+            element = tileset_elements[tileset_path, tileset_hash]
+
+        tilesets.append(_compile_tileset(element, first_gid, os.path.relpath(base, directory)))
+
+    # Go through each layer in the order of the map
+    layers = []
+    for element in root:
+        # Save tiles of the tile layer as an array of tile ids, row after row, and grouped by the chunks they are in
+        if element.tag == "layer":
+            data = element.find("data")
+            if data.get("encoding") != "csv":
+                raise ValueError(f"{path}: only CSV encoded tile layers can be compiled")
+            gids = array("I", map(int, data.text.replace('\n', '').split(',')))
+            layers.append(("tiles", element.get("name"), gids,
+                           _compile_chunks(gids, int(root.get("width")), tilesets)))
+
+        # Save objects of the object group as a table
+        elif element.tag == "objectgroup":
+            layers.append(("objects", element.get("name"),
+                           [_compile_object(obj) for obj in element.findall("object")]))
+
+    return {
+        "version": FORMAT_VERSION,
+        "sources": sources,
+        "width": int(root.get("width")),
+        "height": int(root.get("height")),
+        # Sizes that the chunks were compiled for, the map is compiled again when they change
+        "tile_size": settings.TILE_SIZE,
+        "chunk_size": settings.CHUNK_SIZE,
+        "tilesets": tilesets,
+        "layers": layers
+    }
+
+
+def load_map(path):
+    """Load the map from its compiled file, compile it again if it's missing or out of date"""
+    compiled_path = os.path.splitext(path)[0] + ".lvl"
+
+    # Read the compiled file if there is one, a damaged file or a file of another format is compiled again
+    data = None
+    try:
+        data = _read_map(compiled_path)
+    except (OSError, ValueError, struct.error, zlib.error):
+        pass
+
+    # If it's missing, has other sizes, or any of its sources changed, compile the map again and save it
+    if (data is None or data["tile_size"] != settings.TILE_SIZE or data["chunk_size"] != settings.CHUNK_SIZE or
+            _outdated(data, os.path.dirname(path))):
+        data = compile_map(path)
+        try:
+            _save_map(data, compiled_path)
+        # If the file can't be saved, just use the compiled data this time
+        except OSError:
+            pass
+
+    return CompiledMap(data, os.path.dirname(path))
+
+
+def _save_map(data, path):
+    """Save the compiled data to the file, as a JSON header followed by the arrays of the tile layers"""
+    # Everything except the tile layers is saved in the header
+    header = {key: value for key, value in data.items() if key != "layers"}
+    header["layers"] = []
+
+    arrays = []
+    for kind, name, *content in data["layers"]:
+        # Save the tiles, the positions of the chunks with their numbers of tiles, and the tiles in the chunks
+        if kind == "tiles":
+            gids, chunks = content
+            table = array("i", [value for (column, row), indices in chunks.items()
+                                for value in (column, row, len(indices))])
+            indices = array("I", [index for tiles in chunks.values() for index in tiles])
+            arrays.extend((gids, table, indices))
+
+            # The header only keeps their lengths
+            header["layers"].append((kind, name, len(gids), len(table), len(indices)))
+
+        # Save the objects in the header
+        else:
+            header["layers"].append((kind, name, content[0]))
+
+    # Write the prefix, then compress the header and the arrays after it
+    header = json.dumps(header, separators=(',', ':')).encode()
+    body = b"".join([HEADER.pack(len(header)), header] + [_array_bytes(values) for values in arrays])
+    with open(path, "wb") as file:
+        file.write(PREFIX.pack(MAGIC, FORMAT_VERSION) + zlib.compress(body, 9))
+
+
+def _read_map(path):
+    """Read the compiled data from the file, raise ValueError if it's of another format"""
+    with open(path, "rb") as file:
+        content = file.read()
+
+    # Check the prefix before reading the rest
+    magic, version = PREFIX.unpack_from(content)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path}: not a compiled map of version {FORMAT_VERSION}")
+
+    # Get the header from the compressed part
+    body = zlib.decompress(content[PREFIX.size:])
+    header_length, = HEADER.unpack_from(body)
+    offset = HEADER.size + header_length
+    data = json.loads(body[HEADER.size:offset])
+
+    # JSON keeps only text keys, turn ids of the tiles in collections back into numbers
+    for tileset in data["tilesets"]:
+        tileset["tiles"] = {int(tile_id): image for tile_id, image in tileset["tiles"].items()}
+        tileset["sizes"] = {int(tile_id): size for tile_id, size in tileset["sizes"].items()}
+
+    # Read the arrays of the tile layers in the order they were saved
+    layers = []
+    for kind, name, *content in data["layers"]:
+        if kind == "tiles":
+            gids, offset = _read_array(body, offset, "I", content[0])
+            table, offset = _read_array(body, offset, "i", content[1])
+            indices, offset = _read_array(body, offset, "I", content[2])
+
+            # Split the tiles by the chunks, in the order of the table
+            chunks = {}
+            start = 0
+            for column, row, count in zip(table[::3], table[1::3], table[2::3]):
+                chunks[column, row] = indices[start:start + count]
+                start += count
+
+            layers.append((kind, name, gids, chunks))
+        else:
+            layers.append((kind, name, content[0]))
+
+    data["layers"] = layers
+    return data
+
+
+def _array_bytes(values):
+    """Get the bytes of the array, in little-endian order on every system"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def _read_array(body, offset, typecode, length):
+    """Read the array of the length from the offset in little-endian bytes, return it with the offset after it"""
+    values = array(typecode)
+    end = offset + length * values.itemsize
+    if end > len(body):
+        raise ValueError("compiled map is cut short")
+    values.frombytes(body[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values, end
+
+
+def _compile_tileset(element, first_gid, base):
+    """Compile the tileset element, the images are relative to the base directory"""
+    tileset = {
+        "first_gid": first_gid,
+        "tile_width": int(element.get("tilewidth")),
+        "tile_height": int(element.get("tileheight")),
+        "spacing": int(element.get("spacing", 0)),
+        "margin": int(element.get("margin", 0)),
+        "columns": int(element.get("columns", 0)),
+        # Number of tile ids that the tileset uses, empty tilesets share their first id with the next one
+        "tile_count": int(element.get("tilecount", 0)),
+        "image": None,
+        "tiles": {},
+        "sizes": {}
+    }
+
+    # If the tileset is a single image, save its path
+    image = element.find("image")
+    if image is not None:
+        tileset["image"] = os.path.normpath(os.path.join(base, image.get("source")))
+
+    # Save the images of a tileset that is a collection of images
+    for tile in element.findall("tile"):
+        image = tile.find("image")
+        if image is not None:
+            tileset["tiles"][int(tile.get("id"))] = os.path.normpath(os.path.join(base, image.get("source")))
+            tileset["sizes"][int(tile.get("id"))] = (int(image.get("width")), int(image.get("height")))
+
+    # Ids of a collection can have gaps after tiles were removed from it, make sure all of them are counted
+    if tileset["tiles"]:
+        tileset["tile_count"] = max(tileset["tile_count"], max(tileset["tiles"]) + 1)
+
+    return tileset
+
+
+def _compile_chunks(gids, width, tilesets):
+    """Group the tiles of the layer by the chunks they are baked into, each chunk gets the indices of its tiles"""
+    # Size of a singular chunk in pixels
+    size = settings.CHUNK_SIZE * settings.TILE_SIZE
+
+    chunks = {}
+    # Go through each tile, get its position and size in pixels
+    for index, gid in enumerate(gids):
+        if gid:
+            pos_x = index % width * settings.TILE_SIZE
+            pos_y = index // width * settings.TILE_SIZE
+            tile_width, tile_height = _get_tile_size(tilesets, gid)
+
+            # Save it in each chunk that it covers, relatively to the chunk's position
+            for column in range(pos_x // size, (pos_x + tile_width - 1) // size + 1):
+                for row in range(pos_y // size, (pos_y + tile_height - 1) // size + 1):
+                    chunks.setdefault((column, row), array("I")).append(index)
+
+    return chunks
+
+
+def _get_tileset(tilesets, tile_id):
+    """Get the tileset whose ids contain the tile id (without flip flags)"""
+    return next(tileset for tileset in tilesets
+                if tileset["first_gid"] <= tile_id < tileset["first_gid"] + tileset["tile_count"])
+
+
+def _get_tile_size(tilesets, gid):
+    """Get the size of the tile with the given id in pixels, after it's flipped"""
+    tileset = _get_tileset(tilesets, gid & GID_MASK)
+    tile_id = (gid & GID_MASK) - tileset["first_gid"]
+
+    # Get the size of the tile's image in a collection, or the size of tiles in the tileset image
+    if tileset["tiles"]:
+        width, height = tileset["sizes"][tile_id]
+    else:
+        width, height = tileset["tile_width"], tileset["tile_height"]
+
+    # Flipping diagonally turns the tile
+    return (height, width) if gid & FLIP_DIAGONAL else (width, height)
+
+
+def _compile_object(element):
+    """Compile the object element into a tuple"""
+    # Get the position and the size of the object
+    pos_x = float(element.get("x", 0))
+    pos_y = float(element.get("y", 0))
+    width = float(element.get("width", 0))
+    height = float(element.get("height", 0))
+
+    # Tiled saves the bottom of tile objects, move them to their top like other objects
+    gid = int(element.get("gid", 0))
+    if gid:
+        pos_y -= height
+
+    # Go through the children of the object once, instead of searching for each kind of them
+    properties = {}
+    points = None
+    for child in element:
+        # Get its properties
+        if child.tag == "properties":
+            properties = _compile_properties(child)
+
+        # Get the points of a polygon or a polyline, relative to the map
+        elif child.tag in ("polygon", "polyline"):
+            points = tuple((pos_x + float(point_x), pos_y + float(point_y)) for point_x, point_y in
+                           (point.split(',') for point in child.get("points").split()))
+
+    return element.get("name"), pos_x, pos_y, width, height, gid, properties, points
+
+
+def _compile_properties(element):
+    """Get the properties in the properties element, converted to their types"""
+    properties = {}
+    for prop in element:
+        value = prop.get("value", prop.text)
+        prop_type = prop.get("type", "string")
+
+        # Convert the value based off its type
+        if prop_type == "int":
+            value = int(value)
+        elif prop_type == "float":
+            value = float(value)
+        elif prop_type == "bool":
+            value = value == "true"
+
+        properties[prop.get("name")] = value
+
+    return properties
+
+
+def _hash(path):
+    """Get the hash of the file's content"""
+    with open(path, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _outdated(data, directory):
+    """Check if any of the files that the map was compiled from changed"""
+    try:
+        return any(_hash(os.path.join(directory, source)) != source_hash
+                   for source, source_hash in data["sources"].items())
+    # If any of them is missing, the map can't be up-to-date
+    except OSError:
+        return True
+
+
+class CompiledMap:
+    """Map loaded from the compiled data, offers the parts of a pytmx map that the game uses"""
+    def __init__(self, data, directory):
+        """Create the map"""
+        # Dimensions of the map in tiles
+        self.width = data["width"]
+        self.height = data["height"]
+
+        # Tilesets sorted from the last one, and the directory that their images are relative to
+        self.tilesets = sorted(data["tilesets"], key=lambda tileset: tileset["first_gid"], reverse=True)
+        self.directory = directory
+
+        # Images of the tiles, stored by their ids
+        self.images = {}
+
+        # Layers stored by their names
+        self.layers = {}
+        for kind, name, *content in data["layers"]:
+            if kind == "tiles":
+                self.layers[name] = TileLayer(self, *content)
+            else:
+                self.layers[name] = [MapObject(self, *obj) for obj in content[0]]
+
+        # Solid flags of the collision layer's tiles, row after row (None if the map doesn't have that layer)
+        self.collision = bytes(map(bool, self.layers[COLLISION_LAYER].gids)) if COLLISION_LAYER in self.layers \
+            else None
+
+    def get_layer_by_name(self, name):
+        """Get the layer with the given name"""
+        return self.layers[name]
+
+    def get_image(self, gid):
+        """Get the image of the tile with the given id (with its flip flags), create each one only once"""
+        if gid not in self.images:
+            self.images[gid] = self._create_image(gid)
+
+        return self.images[gid]
+
+    def _create_image(self, gid):
+        """Create the image of the tile with the given id"""
+        # Find the tileset of the tile, the one whose ids contain it
+        tile_id = gid & GID_MASK
+        tileset = _get_tileset(self.tilesets, tile_id)
+        tile_id -= tileset["first_gid"]
+
+        # If the tileset is a collection of images, get the tile's one
+        if tileset["tiles"]:
+            image = self._load_image(tileset["tiles"][tile_id])
+        # Otherwise cut the tile out of the tileset image
+        else:
+            pos_x = tileset["margin"] + (tileset["tile_width"] + tileset["spacing"]) * (tile_id % tileset["columns"])
+            pos_y = tileset["margin"] + (tileset["tile_height"] + tileset["spacing"]) * (tile_id // tileset["columns"])
+            image = self._load_image(tileset["image"]).subsurface(
+                (pos_x, pos_y, tileset["tile_width"], tileset["tile_height"]))
+
+        # Flip the tile like Tiled does
+        if gid & FLIP_DIAGONAL:
+            image = pygame.transform.flip(pygame.transform.rotate(image, 270), True, False)
+        if gid & (FLIP_X | FLIP_Y):
+            image = pygame.transform.flip(image, bool(gid & FLIP_X), bool(gid & FLIP_Y))
+
+        return image
+
+    def _load_image(self, path):
+        """Load the tileset image, each one only once for every map"""
+        path = os.path.normpath(os.path.join(self.directory, path))
+        if path not in tileset_images:
+            tileset_images[path] = pygame.image.load(path).convert_alpha()
+
+        return tileset_images[path]
+
+
+class TileLayer:
+    """Layer of tiles in a compiled map"""
+    def __init__(self, level_map, gids, chunks):
+        """Create the layer"""
+        # Map of the layer and ids of its tiles, row after row
+        self.map = level_map
+        self.gids = gids
+        # Indices of the tiles in each chunk that they are baked into
+        self.chunk_tiles = chunks
+
+    def tiles(self):
+        """Get the position and the image of every tile in the layer"""
+        width = self.map.width
+        for index, gid in enumerate(self.gids):
+            if gid:
+                yield index % width, index // width, self.map.get_image(gid)
+
+    def get_blits(self, chunk):
+        """Get the images of the tiles in the chunk, with their positions relative to it"""
+        # Position of the chunk in pixels
+        size = settings.CHUNK_SIZE * settings.TILE_SIZE
+        left = chunk[0] * size
+        top = chunk[1] * size
+
+        width = self.map.width
+        return [(self.map.get_image(self.gids[index]),
+                 (index % width * settings.TILE_SIZE - left, index // width * settings.TILE_SIZE - top))
+                for index in self.chunk_tiles[chunk]]
+
+
+class MapObject:
+    """Object in a compiled map"""
+    def __init__(self, level_map, name, pos_x, pos_y, width, height, gid, properties, points):
+        """Create the object"""
+        # Map of the object
+        self.map = level_map
+
+        # Name, position, size and tile id of the object
+        self.name = name
+        self.x = pos_x
+        self.y = pos_y
+        self.width = width
+        self.height = height
+        self.gid = gid
+
+        # Its properties, and the points of its shape if it's a polygon or a polyline
+        self.properties = properties
+        self.points = tuple(Point(*point) for point in points) if points else None
+
+    @property
+    def image(self):
+        """Get the image of the tile object"""
+        return self.map.get_image(self.gid) if self.gid else None
+
+
+def benchmark(paths, repeats=20):
+    """Print how long loading each map with every tile image takes with pytmx, the parser and from the compiled file,
+    each time without the tilesets that earlier loads cached"""
+    # Loading the images needs a display, use a hidden one
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    # Use pytmx to compare, if it's installed
+    try:
+        from pytmx.util_pygame import load_pygame
+    except ImportError:
+        load_pygame = None
+
+    for map_path in paths:
+        # Compile the map first, so loading it doesn't include compiling
+        load_map(map_path)
+
+        # Time the average of each way of loading, until the images of the tiles are ready like pytmx makes them
+        times = {"parse": _time(lambda path: _load_images(CompiledMap(compile_map(path), os.path.dirname(path))),
+                                map_path, repeats),
+                 "compiled": _time(lambda path: _load_images(load_map(path)), map_path, repeats)}
+        if load_pygame:
+            times["pytmx"] = _time(load_pygame, map_path, repeats)
+
+        # Print them in milliseconds, with the speedup over pytmx
+        line = f"{os.path.basename(map_path)}: " + ", ".join(f"{name} {time * 1000:.2f} ms"
+                                                               for name, time in times.items())
+        if load_pygame:
+            line += f", {times['pytmx'] / times['parse']:.1f}x speedup parsed, " \
+                    f"{times['pytmx'] / times['compiled']:.1f}x speedup compiled"
+        print(line)
+
+
+def _load_images(level_map):
+    """Create the image of every tile and tile object that the compiled map uses"""
+    for layer in level_map.layers.values():
+        if isinstance(layer, TileLayer):
+            for gid in set(layer.gids) - {0}:
+                level_map.get_image(gid)
+        else:
+            for obj in layer:
+                obj.image
+
+
+def _time(function, path, repeats):
+    """Get the average time of calling the function with the path, in seconds, each call starts with empty caches"""
+    total_time = 0
+    for repeat in range(repeats):
+        tileset_images.clear()
+        tileset_elements.clear()
+
+        start_time = perf_counter()
+        function(path)
+        total_time += perf_counter() - start_time
+
+    return total_time / repeats
+
+
+# Compile the maps given as arguments, or every map of the game, or benchmark loading them
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--benchmark"]
+    paths = arguments or [os.path.join(settings.BASE_PATH, "../data/levels", name)
+                          for name in sorted(os.listdir(os.path.join(settings.BASE_PATH, "../data/levels")))
+                          if name.endswith(".tmx")] + [
+        os.path.join(settings.BASE_PATH, "../data/overworld/overworld.tmx")]
+
+    if "--benchmark" in sys.argv:
+        benchmark(paths)
+    else:
+        for map_path in paths:
+            _save_map(compile_map(map_path), os.path.splitext(map_path)[0] + ".lvl")
+            print(f"Compiled {map_path}")
@@ -7,12 +7,15 @@ from pygame.math import Vector2 as vector
 from src.sprites import Sprite
 from src.settings import settings
 from src.timer import Timer
+from src.utilities import utilities
 
 
 class SpikeBall(Sprite):
-    """Spike ball that moves in semicircular directions, damage player"""
-    def __init__(self, pos, surface, group, radius, speed, start_angle, end_angle,
-                 pos_z=settings.LAYERS_DEPTH["main"]):
+    """Spike ball that moves in semicircular directions, damage player, moves its chain with it"""
+    # Spike ball changes its position, so it can't be kept in a static place of the grid
+    dynamic = True
+
+    def __init__(self, pos, surface, group, radius, speed, start_angle, end_angle, chain_surface, chain_group):
         """Create the spike ball"""
         # Center of the spike
         self.center = pos
@@ -33,11 +36,21 @@ class SpikeBall(Sprite):
         # Direction of it
         self.direction = 1
 
-        # Calculate the horizontal and vertical position based off trigonometry rules
-        pos_x = self.center[0] + math.cos(math.radians(self.angle)) * self.radius
-        pos_y = self.center[1] + math.sin(math.radians(self.angle)) * self.radius
-        # Initialize the parent sprite with them
-        super().__init__((pos_x, pos_y), surface, group, pos_z)
+        # Area the spike ball and its chain can reach, it's active whenever this area is near the camera
+        self.activity_rect = pygame.FRect(0, 0, 2 * self.radius + surface.get_width(),
+                                          2 * self.radius + surface.get_height())
+        self.activity_rect.center = self.center
+
+        # Initialize the parent sprite in the center, it's moved with the chain below
+        super().__init__(pos, surface, group)
+
+        # Create a chain link every 20 pixels from the center, save their distances from it and their group
+        self.chain_radii = list(range(0, self.radius, 20))
+        self.chain_group = chain_group
+        self.chain = [SpikeChain(pos, chain_surface, chain_group) for chain_radius in self.chain_radii]
+
+        # Place the spike ball and its chain
+        self._set_pos()
 
     def update(self, delta_time):
         """Update spike ball"""
@@ -54,16 +67,54 @@ class SpikeBall(Sprite):
                 self.direction = 1
 
         # Recalculate the positions
-        pos_x = self.center[0] + math.cos(math.radians(self.angle)) * self.radius
-        pos_y = self.center[1] + math.sin(math.radians(self.angle)) * self.radius
+        self._set_pos()
+
+    def catch_up(self, elapsed):
+        """Catch up the angle after sleeping for the elapsed time"""
+        # Get the angle it would rotate by
+        rotation = self.speed * elapsed
+
+        # Rotate it in circle, or bounce between the start and the end angles
+        if self.circular:
+            self.angle = (self.angle + self.direction * rotation) % 360
+        else:
+            self.angle, self.direction = utilities.bounce(self.angle, self.direction, self.start_angle,
+                                                          self.end_angle, rotation)
+
+        # Recalculate the positions of the spike ball and its chain
+        self._set_pos()
+
+    def _set_pos(self):
+        """Set the positions of the spike ball and its chain based off the angle"""
+        # Calculate the direction from the center only once, for the entire chain
+        cos = math.cos(math.radians(self.angle))
+        sin = math.sin(math.radians(self.angle))
 
         # Set the new position of the rectangle
-        self.rect.center = (pos_x, pos_y)
+        self.rect.center = (self.center[0] + cos * self.radius, self.center[1] + sin * self.radius)
+
+        # Place every link of the chain on the same line, at its distance, move it in its group too
+        for link, radius in zip(self.chain, self.chain_radii):
+            link.rect.center = (self.center[0] + cos * radius, self.center[1] + sin * radius)
+            self.chain_group.move(link)
+
+
+class SpikeChain(Sprite):
+    """Link of the spike ball's chain, moved by its spike ball"""
+    # The link is kept in the grid like a static sprite, the spike ball moves it there with itself
+    carried = True
+
+    def __init__(self, pos, surface, group):
+        """Create the chain link"""
+        super().__init__(pos, surface, group, settings.LAYERS_DEPTH["bg_details"])
 
 
 class Tooth(pygame.sprite.Sprite):
     """Tooth enemy, that runs around"""
-    def __init__(self, pos, frames, group, collision_sprites):
+    # Tooth runs around, groups need to check his position every time
+    dynamic = True
+
+    def __init__(self, pos, frames, group, collision_sprites, terrain):
         """Initialize the tooth enemy"""
         super().__init__(group)
         # Prepare the animation variables
@@ -84,15 +135,17 @@ class Tooth(pygame.sprite.Sprite):
 
         # Rectangles of sprites that he can collide with
         self.collision_rects = [sprite.rect for sprite in collision_sprites]
+        # Grid of solid terrain tiles
+        self.terrain = terrain
+
+        # Calculate the bounds that he walks between
+        self._find_patrol()
 
         # Cooldown of getting hit
         self.hit_timer = Timer(250)
 
     def update(self, delta_time):
         """Update the Tooth"""
-        # Update the immunity timer
-        self.hit_timer.update()
-
         # Move the Tooth
         self._move(delta_time)
 
@@ -106,32 +159,80 @@ class Tooth(pygame.sprite.Sprite):
         # Make sure to not pass the number of frames
         self.image = self.frames[int(self.frame % len(self.frames))]
 
-        # Flip the image horizontally if he is moving left
+        # Use the horizontally flipped image if he is moving left
         if self.direction < 0:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = utilities.flip(self.image, True, False)
+
+    def catch_up(self, elapsed):
+        """Catch up the animation after sleeping for the elapsed time, he stays where he fell asleep"""
+        self.frame = (self.frame + settings.ANIMATION_SPEED * elapsed) % len(self.frames)
 
     def _move(self, delta_time):
         """Move and change direction of the Tooth"""
+        # If the terrain changed, calculate the patrol bounds again
+        if self.terrain_version != self.terrain.version:
+            self._find_patrol()
+
         # Move him
         self.rect.x += self.direction * self.speed * delta_time
 
-        # Get his bottom edge rectangles, to calculate collisions
-        bottom_left_rect = pygame.FRect(self.rect.bottomleft, (-1, 1))
-        bottom_right_rect = pygame.FRect(self.rect.bottomright, (1, 1))
-
-        # If he moves left and there the floor ends, change his direction
-        if bottom_left_rect.collidelist(self.collision_rects) < 0 and self.direction < 0:
+        # If he reached the left end of his patrol while moving left, change his direction
+        if self.rect.left <= self.patrol_left and self.direction < 0:
             self.direction *= -1
 
-        # Do the same for the right direction
-        if bottom_right_rect.collidelist(self.collision_rects) < 0 < self.direction:
+        # Do the same for the right end and direction
+        if self.rect.right >= self.patrol_right and self.direction > 0:
             self.direction *= -1
 
-        # Get the rectangle of the Tooth, that can check if there are any walls near
-        wall_rect = pygame.FRect(self.rect.topleft + vector(-1, 0), (self.rect.width + 2, 1))
-        # Reverse enemy's direction if he touches a collide-able sprite
-        if wall_rect.collidelist(self.collision_rects) != -1:
-            self.direction *= -1
+    def _find_patrol(self):
+        """Calculate the bounds of the floor and walls that the Tooth walks between"""
+        # Save the terrain version that the bounds are calculated for
+        self.terrain_version = self.terrain.version
+
+        # Get the solid parts of the floor, that is right under the Tooth
+        floor = self._get_solid_spans(self.rect.bottom)
+        # Get the solid parts on the level of his top edge, that work as walls
+        walls = self._get_solid_spans(self.rect.top)
+
+        # By default, let the Tooth turn in the place he stands
+        self.patrol_left = self.rect.left
+        self.patrol_right = self.rect.right
+
+        # Find the floor span that he stands on, he can walk to both ends of it
+        for left, right in floor:
+            if left <= self.rect.centerx <= right:
+                self.patrol_left = left
+                self.patrol_right = right
+
+        # Go through each wall, if it's between the Tooth and the end of his floor, stop before it
+        for left, right in walls:
+            # Wall on the left
+            if right <= self.rect.centerx:
+                self.patrol_left = max(self.patrol_left, right + 1)
+            # Wall on the right
+            elif left >= self.rect.centerx:
+                self.patrol_right = min(self.patrol_right, left - 1)
+
+    def _get_solid_spans(self, pos_y):
+        """Get the horizontal spans of the terrain and collide-able sprites at the vertical position"""
+        # Get the row of tiles, that starts at this position
+        row = int(pos_y // self.terrain.tile_size)
+
+        # Save the spans of each solid tile from the row
+        spans = [(column * self.terrain.tile_size, (column + 1) * self.terrain.tile_size)
+                 for column in range(self.terrain.width) if self.terrain.is_solid(column, row)]
+        # Add the spans of sprites that are at this position
+        spans += [(rect.left, rect.right) for rect in self.collision_rects if rect.top <= pos_y < rect.bottom]
+
+        # Merge the spans that touch or overlap, from the left
+        merged = []
+        for left, right in sorted(spans):
+            if merged and left <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], right))
+            else:
+                merged.append((left, right))
+
+        return merged
 
     def reverse(self):
         """Reverse direction of the Tooth"""
@@ -157,8 +258,8 @@ class Shell(pygame.sprite.Sprite):
                 self.frames[animation_type] = []
                 # Go through each of the images
                 for surface in surfaces:
-                    # Flip them horizontally and append to the frames list of this specific animation type
-                    self.frames[animation_type].append(pygame.transform.flip(surface, True, False))
+                    # Get them flipped horizontally and append to the frames list of this specific animation type
+                    self.frames[animation_type].append(utilities.flip(surface, True, False))
 
             # Set the projectile direction to the left
             self.projectile_direction = -1
@@ -197,15 +298,22 @@ class Shell(pygame.sprite.Sprite):
 
     def update(self, delta_time):
         """Update the shell enemy"""
-        # Update the attack cooldown timer
-        self.attack_timer.update()
-
         # Change state of the shell if player is near
         self._set_state()
 
         # Animate the shell
         self._animate(delta_time)
 
+    def catch_up(self, elapsed):
+        """Catch up the animation after sleeping for the elapsed time"""
+        # If the shell was attacking, the attack is already over
+        if self.state == "fire":
+            self.state = "idle"
+            self.shoot = False
+
+        # Move the idle animation further
+        self.frame = (self.frame + settings.ANIMATION_SPEED * elapsed) % len(self.frames[self.state])
+
     def _set_state(self):
         """Set state of the shell"""
         # Get player's and shell's positions for range calculations
@@ -263,6 +371,11 @@ class Shell(pygame.sprite.Sprite):
 
 class Pearl(pygame.sprite.Sprite):
     """Pearl shot by the shell enemy"""
+    # Pearls fly, so they are moving sprites
+    dynamic = True
+    # Pearls have to fly until they disappear, even far away
+    always_active = True
+
     def __init__(self, pos, surface, group, speed, direction):
         """Initialize the pearl projectile"""
         super().__init__(group)
@@ -281,9 +394,9 @@ class Pearl(pygame.sprite.Sprite):
         # Its depth position
         self.pos_z = settings.LAYERS_DEPTH["main"]
 
-        # Shell timers
+        # Shell timers, destroy the pearl when its life-time ends
         self.timers = {
-            "duration": Timer(5000),
+            "duration": Timer(5000, self.kill),
             "hit": Timer(250)
         }
         # Activate the pearl life-time timer
@@ -291,17 +404,9 @@ class Pearl(pygame.sprite.Sprite):
 
     def update(self, delta_time):
         """Update the pearl"""
-        # Update every pearl's timer
-        for timer in self.timers.values():
-            timer.update()
-
         # Move the pearl
         self.rect.x += self.direction * self.speed * delta_time
 
-        # If duration of the pearl ended, destroy it
-        if not self.timers["duration"].active:
-            self.kill()
-
     def reverse(self):
         """Reverse direction of the pearl"""
         # If there isn't any cooldown, change the direction
@@ -1,27 +1,184 @@
-import random
+import math
+from bisect import insort
 
 import pygame.sprite
 from pygame.math import Vector2 as vector
 
 from src.settings import settings
-from src.sprites import Sprite, Cloud
-from src.timer import Timer
+from src.utilities import utilities
+from src.clouds import CloudField
+from src.spatial import SpatialGrid
+from src.chunks import TiledPlane
 
 
-class Sprites(pygame.sprite.Group):
+class DepthSprites(pygame.sprite.Group):
+    """Group that keeps its sprites in buckets of their depth"""
+    def __init__(self):
+        """Initialize the group"""
+        super().__init__()
+
+        # Grids of sprites stored by their depth, to draw only the ones that are visible
+        self.layers = {}
+        # Sorted depths of all the layers
+        self.depths = []
+        # Depth of every sprite placed in a layer
+        self.sprite_depths = {}
+
+        # Sprites that were added, but aren't placed in their layer yet (their depth and position may still change)
+        self.pending = {}
+
+        # Sprites that move, and their positions from before the last simulation step
+        self.moving = {}
+
+    def add_internal(self, sprite, layer=None):
+        """Add the sprite to the group, place it in its layer later"""
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+
+        # If the sprite moves or something moves it, remember it
+        # (it may not have a rectangle yet, its position is saved before each step)
+        if getattr(sprite, "dynamic", False) or getattr(sprite, "carried", False):
+            self.moving[sprite] = None
+
+    def remove_internal(self, sprite):
+        """Remove the sprite from the group and from its layer"""
+        super().remove_internal(sprite)
+        self.moving.pop(sprite, None)
+
+        # If the sprite wasn't placed yet, just forget it
+        if sprite in self.pending:
+            del self.pending[sprite]
+        # Otherwise remove it from its layer
+        else:
+            self._remove_from_layer(sprite, self.sprite_depths.pop(sprite))
+
+    def update(self, *args, **kwargs):
+        """Update the sprites, remember where the moving ones were before"""
+        self._save_moving()
+        super().update(*args, **kwargs)
+
+    def move(self, sprite):
+        """Move the static sprite in its layer, after something else changed its rectangle"""
+        # If the sprite wasn't placed yet, it will be placed in its current position
+        if sprite not in self.pending:
+            self.layers[self.sprite_depths[sprite]].move(sprite)
+
+    def _save_moving(self):
+        """Save the positions of moving sprites, from before the simulation step"""
+        for sprite in self.moving:
+            self.moving[sprite] = sprite.rect.topleft
+
+    def interpolate(self, sprite, alpha):
+        """Get the position of the sprite in between the last two simulation steps"""
+        # If the sprite doesn't move or wasn't updated yet, return its position
+        if self.moving.get(sprite) is None:
+            return vector(sprite.rect.topleft)
+
+        # Otherwise move from the last position towards the current one
+        return vector(self.moving[sprite]).lerp(sprite.rect.topleft, alpha)
+
+    def _get_blits(self, sprites, alpha):
+        """Get the images and positions of the sprites, with the offset of the camera"""
+        return [(sprite.image, self.interpolate(sprite, alpha) + self.offset) if sprite in self.moving else
+                (sprite.image, (sprite.rect.x + self.offset.x, sprite.rect.y + self.offset.y))
+                for sprite in sprites]
+
+    def _place_pending(self):
+        """Place the waiting sprites in layers of their depth"""
+        # Go through each of them
+        for sprite in self.pending:
+            # Create a new layer if there isn't one with this depth
+            if sprite.pos_z not in self.layers:
+                self.layers[sprite.pos_z] = SpatialGrid()
+                self._add_depth(sprite.pos_z)
+
+            # Place the sprite in its layer, remember the depth
+            self._add_to_layer(sprite, sprite.pos_z)
+            self.sprite_depths[sprite] = sprite.pos_z
+
+        # Nothing waits anymore
+        self.pending.clear()
+
+    def _add_depth(self, depth):
+        """Add the depth to the sorted depths, if it isn't there already"""
+        if depth not in self.depths:
+            insort(self.depths, depth)
+
+    def _add_to_layer(self, sprite, depth):
+        """Add the sprite to the layer"""
+        self.layers[depth].add(sprite)
+
+    def _remove_from_layer(self, sprite, depth):
+        """Remove the sprite from the layer"""
+        self.layers[depth].remove(sprite)
+
+
+class CollisionSprites(pygame.sprite.Group):
+    """Group of sprites that can collide, able to find the ones near the given area"""
+    def __init__(self):
+        """Initialize the group"""
+        super().__init__()
+
+        # Grid of the sprites, static ones are stored in cells, moving ones are checked separately
+        self.grid = SpatialGrid()
+
+        # Sprites that were added, but aren't placed in the grid yet (their rectangles may still change)
+        self.pending = {}
+
+    def add_internal(self, sprite, layer=None):
+        """Add the sprite to the group, place it in the grid later"""
+        super().add_internal(sprite, layer)
+        self.pending[sprite] = None
+
+    def remove_internal(self, sprite):
+        """Remove the sprite from the group and from the grid"""
+        super().remove_internal(sprite)
+
+        # If the sprite wasn't placed yet, just forget it
+        if sprite in self.pending:
+            del self.pending[sprite]
+        # Otherwise remove it from the grid
+        else:
+            self.grid.remove(sprite)
+
+    def nearby(self, rect):
+        """Get the sprites that are near the given rectangle, in the order they were added"""
+        # Place the waiting sprites in the grid
+        for sprite in self.pending:
+            self.grid.add(sprite)
+        self.pending.clear()
+
+        # Return the sprites from the grid
+        return self.grid.query(rect)
+
+
+class Sprites(DepthSprites):
     """Group of all sprites"""
     def __init__(self, level_width, level_height, clouds, horizon_line, bg_tile=None, top_limit=0):
         """Initialize the sprite group"""
         super().__init__()
+
+        # Time that the level was simulated for
+        self.time = 0
+        # Time until which each sprite was updated, sprites far from the camera sleep and fall behind
+        self.update_times = {}
+        # Sprites that are updated even when they are far away
+        self.always_active = {}
+        # Sprites that move other sprites around them, they are active when the area they reach is
+        self.rigs = {}
+
         # Get the main surface
         self.surface = pygame.display.get_surface()
 
-        # Get dimensions from the level in pixels
-        self.width = level_width * settings.TILE_SIZE
-        self.height = level_height * settings.TILE_SIZE
+        # Static tiles baked into chunks, stored by their depth
+        self.chunks = {}
+
+        # Get dimensions of the level in pixels
+        self.width = level_width
+        self.height = level_height
 
-        # Create the background
-        self._create_bg(bg_tile, level_width, level_height, int(top_limit / settings.TILE_SIZE) - 1)
+        # Create the background, the tile repeated over the camera view (the camera never leaves the level)
+        self.bg = TiledPlane([bg_tile]) if bg_tile else None
 
         # Horizon line position
         self.horizon_line = horizon_line
@@ -40,63 +197,142 @@ class Sprites(pygame.sprite.Group):
         # Create sky if needed
         self._create_clouds(clouds)
 
-        # Offset of the camera
+        # Offset of the camera after the last simulation step, and before it
+        self.camera = vector()
+        self.last_camera = vector()
+        # Offset of the camera in between them, used for drawing
         self.offset = vector()
 
-    def draw(self, target_pos, delta_time):
-        """Draw the sprites"""
+    def add_internal(self, sprite, layer=None):
+        """Add the sprite to the group, it is up-to-date from now"""
+        super().add_internal(sprite, layer)
+        self.update_times[sprite] = self.time
+
+        # Remember the sprite if it can't sleep
+        if getattr(sprite, "always_active", False):
+            self.always_active[sprite] = None
+        # Remember the sprite if it has a larger area than its rectangle
+        if hasattr(sprite, "activity_rect"):
+            self.rigs[sprite] = None
+
+    def remove_internal(self, sprite):
+        """Remove the sprite from the group"""
+        super().remove_internal(sprite)
+        self.update_times.pop(sprite, None)
+        self.always_active.pop(sprite, None)
+        self.rigs.pop(sprite, None)
+
+    def update(self, delta_time):
+        """Update the sprites near the camera, catch up the ones that wake up"""
+        # Save where the moving sprites and the camera are before the step
+        self._save_moving()
+        self.last_camera = self.camera.copy()
+
+        # Place the new sprites in their layers
+        self._place_pending()
+
+        # Get the rectangle of the part of the level that is active, around the camera
+        active_rect = pygame.FRect(-self.camera.x, -self.camera.y, settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+        active_rect.inflate_ip(settings.ACTIVITY_MARGIN * 2, settings.ACTIVITY_MARGIN * 2)
+
+        # Get the sprites that can't sleep, the ones that reach into the active part, and every sprite from it
+        active = dict(self.always_active)
+        active.update((rig, None) for rig in self.rigs if rig.activity_rect.colliderect(active_rect))
+        for depth in self.depths:
+            if depth in self.layers:
+                active.update(dict.fromkeys(self.layers[depth].query(active_rect)))
+
+        # Update each active sprite
+        for sprite in active:
+            # Skip the sprite if the update of another one removed it
+            if sprite not in self.update_times:
+                continue
+
+            # If the sprite was sleeping, catch it up with the time it missed
+            if self.update_times[sprite] < self.time and hasattr(sprite, "catch_up"):
+                sprite.catch_up(self.time - self.update_times[sprite])
+            self.update_times[sprite] = self.time + delta_time
+
+            sprite.update(delta_time)
+
+        # Move the large and the small clouds
+        if self.sky:
+            self._move_large_clouds(delta_time)
+            self.cloud_field.update(delta_time)
+
+        # Move the time forward
+        self.time += delta_time
+
+    def move_camera(self, target_pos, snap=False):
+        """Center the camera on the target position, it's done after each simulation step,
+        so the part of the level that is updated doesn't depend on drawing"""
         # Update the offset of the camera
-        self.offset.x = -(target_pos[0] - settings.WINDOW_WIDTH / 2)
-        self.offset.y = -(target_pos[1] - settings.WINDOW_HEIGHT / 2)
+        self.camera.x = -(target_pos[0] - settings.WINDOW_WIDTH / 2)
+        self.camera.y = -(target_pos[1] - settings.WINDOW_HEIGHT / 2)
 
         # Constraint the camera
         self._camera_constraint()
 
+        # If the camera jumps there, it doesn't move from the last position
+        if snap:
+            self.last_camera = self.camera.copy()
+
+    def draw(self, alpha=1):
+        """Draw the sprites, moving ones and the camera in between the last two simulation steps"""
+        # Get the offset of the camera in between the steps, snapped to whole pixels, so the chunks and the sprites
+        # are moved by the same amount (pygame truncates the positions, negative and positive ones differently)
+        self.offset = self.last_camera.lerp(self.camera, alpha)
+        self.offset.update(round(self.offset.x), round(self.offset.y))
+
         # If there is sky, draw it
         if self.sky:
             # Draw the sky
             self._draw_sky()
             # Draw large clouds
-            self._draw_large_clouds(delta_time)
-
-            # Update the cloud appear timer
-            self.cloud_timer.update()
-
-        # Go through each of sprites, sort them by depth, for proper drawing
-        for sprite in sorted(self, key=lambda element: element.pos_z):
-            # Calculate the offset of this specific sprite
-            offset = sprite.rect.topleft + self.offset
-            # Blit them
-            self.surface.blit(sprite.image, offset)
+            self._draw_large_clouds(alpha)
+            # Draw the visible small clouds
+            self.cloud_field.draw(self.surface, self.offset, alpha)
+        # Otherwise draw the background
+        else:
+            self.bg.draw(self.surface, self.offset)
+
+        # Get the rectangle of the part of the level, that the camera sees
+        camera_rect = pygame.FRect(-self.offset.x, -self.offset.y, settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+
+        # Place the new sprites in their layers
+        self._place_pending()
+
+        # Go through each depth, from the deepest one
+        for depth in self.depths:
+            # Draw the baked tiles first, they were created before any other sprite
+            if depth in self.chunks:
+                self.chunks[depth].draw(self.surface, self.offset)
+
+            # Blit all visible sprites of this depth at once, with the offset of the camera
+            if depth in self.layers:
+                self.surface.fblits(self._get_blits(self.layers[depth].query(camera_rect), alpha))
+
+    def add_chunks(self, chunks):
+        """Add the static tiles, baked into chunks of each depth"""
+        for depth, depth_chunks in chunks.items():
+            self.chunks[depth] = depth_chunks
+            self._add_depth(depth)
 
     def _camera_constraint(self):
         """Constraint the camera, when player moves too far"""
         # Change the offset if it's too far to the left
-        if self.offset.x > self.borders["left"]:
-            self.offset.x = self.borders["left"]
+        if self.camera.x > self.borders["left"]:
+            self.camera.x = self.borders["left"]
         # Change the offset to the right border, if it's too far
-        if self.offset.x < self.borders["right"]:
-            self.offset.x = self.borders["right"]
+        if self.camera.x < self.borders["right"]:
+            self.camera.x = self.borders["right"]
 
         # Check if the offset is too far to the bottom, if so, change it to be equal to the bottom of the level
-        if self.offset.y < self.borders["bottom"]:
-            self.offset.y = self.borders["bottom"]
+        if self.camera.y < self.borders["bottom"]:
+            self.camera.y = self.borders["bottom"]
         # Do the same for top
-        if self.offset.y > self.borders["top"]:
-            self.offset.y = self.borders["top"]
-
-    def _create_bg(self, tile, level_width, level_height, top_limit):
-        """Create the background with the given tile"""
-        # If the level has a background, create the background tiles
-        if tile:
-            # Go through each column and row
-            for row in range(-top_limit, level_height):
-                for column in range(level_width):
-                    # Get the tile position in pixels
-                    pos_x = column * settings.TILE_SIZE
-                    pos_y = row * settings.TILE_SIZE
-                    # Create the background tile sprite
-                    Sprite((pos_x, pos_y), tile, self, -1)
+        if self.camera.y > self.borders["top"]:
+            self.camera.y = self.borders["top"]
 
     def _create_clouds(self, clouds):
         """Create sky with clouds"""
@@ -112,81 +348,71 @@ class Sprites(pygame.sprite.Group):
             # Set the large cloud speed and position
             self.large_cloud_speed = 40
             self.large_cloud_x = 0
+            # Distance that the large clouds moved in the last simulation step
+            self.large_cloud_step = 0
 
             # Set dimensions of the large clouds
             self.large_cloud_width = self.large_cloud.get_width()
             self.large_cloud_height = self.large_cloud.get_height()
 
-            # Set the number of tiles that they can occupy
-            self.large_cloud_tiles = int(self.width / self.large_cloud_width / settings.TILE_SIZE) + 2
-
-            # Create clouds every 2,5 seconds, by calling the proper function
-            self.cloud_timer = Timer(2500, self._create_small_cloud, True)
-            # Start the timer
-            self.cloud_timer.start()
-
-            # Create 15 small clouds at the start
-            for cloud_num in range(15):
-                # Get a random position of a cloud
-                pos = (random.randint(0, self.width / settings.TILE_SIZE),
-                       random.randint(self.borders["top"], self.horizon_line))
-                # Choose a random surface
-                surface = random.choice(self.small_clouds)
-
-                # Create a cloud
-                Cloud(pos, surface, self)
+            # Get the large cloud repeated over the width of the screen and one more cloud, so it can wrap around
+            self.large_cloud_strip = utilities.tile(self.large_cloud, (math.ceil(
+                settings.WINDOW_WIDTH / self.large_cloud_width) + 1) * self.large_cloud_width, self.large_cloud_height)
+
+            # Prepare the sky with the sea, tall enough to cover the screen with the horizon at any place on it,
+            # keep a margin around it, so the horizon line doesn't show up when it's out of the screen
+            self.sky_margin = 4
+            self.sky_surface = pygame.Surface((settings.WINDOW_WIDTH,
+                                               (settings.WINDOW_HEIGHT + self.sky_margin) * 2))
+            self.sky_surface.fill("#DDC6A1")
+            # Draw the sea below the horizon and the horizon line with a width of 4
+            horizon_pos = settings.WINDOW_HEIGHT + self.sky_margin
+            pygame.draw.rect(self.sky_surface, "#92A9CE",
+                             pygame.FRect(0, horizon_pos, settings.WINDOW_WIDTH, horizon_pos))
+            pygame.draw.line(self.sky_surface, "#F5F1DE", (0, horizon_pos), (settings.WINDOW_WIDTH, horizon_pos), 4)
+
+            # Create the small clouds, that appear above the horizon
+            self.cloud_field = CloudField(self.small_clouds, self.width, self.borders["top"], self.horizon_line)
 
     def _draw_sky(self):
         """Draw the sky"""
-        # Fill the screen with the sky color
-        self.surface.fill("#DDC6A1")
-
-        # Get position of the horizon in the world
+        # Get position of the horizon on the screen
         horizon_pos = self.horizon_line + self.offset.y
 
-        # Create rectangle indicating sea, up to the horizon line
-        sea_rect = pygame.FRect(0, horizon_pos,
-                                settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT - horizon_pos)
-        # Draw the sea rectangle
-        pygame.draw.rect(self.surface, "#92A9CE", sea_rect)
+        # Move the prepared sky, so its horizon is in this position, but don't let it uncover the screen
+        pos_y = horizon_pos - settings.WINDOW_HEIGHT - self.sky_margin
+        pos_y = min(max(pos_y, settings.WINDOW_HEIGHT - self.sky_surface.get_height()), 0)
 
-        # Draw the horizon line that goes through the entire screen with a width of 4
-        pygame.draw.line(self.surface, "#F5F1DE",
-                         (0, horizon_pos), (settings.WINDOW_WIDTH, horizon_pos), 4)
+        # Draw the sky
+        self.surface.blit(self.sky_surface, (0, pos_y))
 
-    def _draw_large_clouds(self, delta_time):
-        """Draw large clouds and move them"""
-        # Move the large cloud
-        self.large_cloud_x += self.cloud_direction * self.large_cloud_speed * delta_time
+    def _move_large_clouds(self, delta_time):
+        """Move the large clouds by a singular simulation step"""
+        # Move the large cloud, remember by how much
+        self.large_cloud_step = self.cloud_direction * self.large_cloud_speed * delta_time
+        self.large_cloud_x += self.large_cloud_step
 
         # If clouds ended, set them back to horizontal position equal to 0
         if self.large_cloud_x <= -self.large_cloud_width:
             self.large_cloud_x = 0
 
-        # Create as many clouds as there can be to fill width of the screen
-        for cloud_num in range(self.large_cloud_tiles):
-            # Get the left and top location
-            left = self.large_cloud_x + self.large_cloud_width * cloud_num + self.offset.x
-            top = self.horizon_line - self.large_cloud_height + self.offset.y
+    def _draw_large_clouds(self, alpha):
+        """Draw large clouds in between the last two simulation steps"""
+        # Get the position of the clouds in between the steps (they repeat, so the reset to 0 doesn't matter)
+        pos_x = self.large_cloud_x - self.large_cloud_step * (1 - alpha)
 
-            # Blit the large cloud
-            self.surface.blit(self.large_cloud, (left, top))
+        # Get the top location of the clouds
+        top = self.horizon_line - self.large_cloud_height + self.offset.y
+        # Get the location of the first visible cloud, the clouds repeat through the entire level
+        left = (pos_x + self.offset.x) % self.large_cloud_width - self.large_cloud_width
 
-    def _create_small_cloud(self):
-        """Create a random small cloud"""
-        # Choose a random position from behind the right side of screen
-        pos = (random.randint(self.width / settings.TILE_SIZE + 450, self.width / settings.TILE_SIZE + 600),
-               random.randint(self.borders["top"], self.horizon_line))
-        # Get a random cloud surface
-        surface = random.choice(self.small_clouds)
+        # Draw the visible clouds at once
+        self.surface.blit(self.large_cloud_strip, (left, top))
 
-        # Create a cloud with this information
-        Cloud(pos, surface, self)
 
-
-class WorldSprites(pygame.sprite.Group):
+class WorldSprites(DepthSprites):
     """Sprites that appear in the overworld"""
-    def __init__(self, data):
+    def __init__(self, data, water_frames):
         """Initialize the overworld sprites"""
         super().__init__()
 
@@ -196,40 +422,80 @@ class WorldSprites(pygame.sprite.Group):
         # Save data
         self.data = data
 
+        # Water that fills the background
+        self.water = TiledPlane(water_frames)
+
+        # Main objects, kept in order of their vertical position
+        self.main_sprites = []
+
         # Create a camera offset vector
         self.offset = vector()
 
-    def draw(self, pos):
-        """Draw all the overworld sprites in group"""
-        # Calculate offset based off the target position
-        self.offset.x = -(pos[0] - settings.WINDOW_WIDTH / 2)
-        self.offset.y = -(pos[1] - settings.WINDOW_HEIGHT / 2)
-
-        # Go through each sprite sorted by depth value and draw the background
-        for sprite in sorted(self, key=lambda element: element.pos_z):
-            # Offset of sprites
-            offset_pos = sprite.rect.topleft + self.offset
-
-            # If given sprite is more in the background then the main objects, draw them
-            if sprite.pos_z < settings.LAYERS_DEPTH["main"]:
-                # If sprite depth is a path one
-                if sprite.pos_z == settings.LAYERS_DEPTH["path"]:
-                    # If the current level is unlocked, display the node
-                    if sprite.level <= self.data.max_level:
-                        self.surface.blit(sprite.image, offset_pos)
-                # Draw the overworld sprite
-                else:
-                    self.surface.blit(sprite.image, offset_pos)
-
-        # Check all the main objects and draw them in order based off vertical position
-        for sprite in sorted(self, key=lambda element: element.rect.centery):
-            if sprite.pos_z == settings.LAYERS_DEPTH["main"]:
-                # Offset of the main sprite
-                offset_pos = sprite.rect.topleft + self.offset
-
-                # If it's an icon, place it a little higher
-                if hasattr(sprite, "icon"):
-                    self.surface.blit(sprite.image, offset_pos + vector(0, -25))
-                # Otherwise, remain the position
-                else:
-                    self.surface.blit(sprite.image, offset_pos)
+    def draw(self, pos, alpha=1):
+        """Draw all the overworld sprites in group, moving ones in between the last two simulation steps"""
+        # Calculate offset based off the target position, snap it to whole pixels like in the level
+        self.offset.x = round(-(pos[0] - settings.WINDOW_WIDTH / 2))
+        self.offset.y = round(-(pos[1] - settings.WINDOW_HEIGHT / 2))
+
+        # Get the rectangle of the part of the map, that the camera sees
+        camera_rect = pygame.FRect(-self.offset.x, -self.offset.y, settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+
+        # Place the new sprites in their layers
+        self._place_pending()
+
+        # Draw the water under everything
+        self.water.draw(self.surface, self.offset)
+
+        # Go through each depth, that is more in the background than the main objects, and draw it
+        for depth in self.depths:
+            if depth >= settings.LAYERS_DEPTH["main"]:
+                break
+
+            # Get every visible sprite of this depth
+            sprites = self.layers[depth].query(camera_rect)
+            # If sprite depth is a path one, display it only if its level is unlocked
+            if depth == settings.LAYERS_DEPTH["path"]:
+                sprites = [sprite for sprite in sprites if sprite.level <= self.data.max_level]
+
+            # Draw the overworld sprites at once
+            self.surface.fblits(self._get_blits(sprites, alpha))
+
+        # Update the order of the main objects, since they could move
+        self._sort_main()
+
+        # Draw all the main objects at once in order based off vertical position,
+        # if it's an icon, place it a little higher (positions of static sprites are plain tuples)
+        self.surface.fblits([(image, (pos[0], pos[1] - 25) if hasattr(sprite, "icon") else pos)
+                             for sprite, (image, pos) in zip(self.main_sprites,
+                                                             self._get_blits(self.main_sprites, alpha))])
+
+    def _add_to_layer(self, sprite, depth):
+        """Add the sprite to the layer, keep the main objects in order"""
+        super()._add_to_layer(sprite, depth)
+
+        # If the sprite is a main one, insert it after every object that is higher or on the same level
+        if depth == settings.LAYERS_DEPTH["main"]:
+            insort(self.main_sprites, sprite, key=lambda element: element.rect.centery)
+
+    def _remove_from_layer(self, sprite, depth):
+        """Remove the sprite from the layer and from the main objects"""
+        super()._remove_from_layer(sprite, depth)
+
+        # Forget the main object
+        if depth == settings.LAYERS_DEPTH["main"]:
+            self.main_sprites.remove(sprite)
+
+    def _sort_main(self):
+        """Restore the vertical order of the main objects, moving only the ones that changed their place"""
+        # Go through each main object
+        for index in range(1, len(self.main_sprites)):
+            sprite = self.main_sprites[index]
+            position = index
+
+            # Move the higher objects after this one, until there is a place for it
+            while position > 0 and self.main_sprites[position - 1].rect.centery > sprite.rect.centery:
+                self.main_sprites[position] = self.main_sprites[position - 1]
+                position -= 1
+
+            # Put the object in its place
+            self.main_sprites[position] = sprite
@@ -4,18 +4,22 @@ import pygame
 from pygame.math import Vector2 as vector
 
 from src.settings import settings
+from src.utilities import utilities
 from src.sprites import Sprite, MovingSprite, AnimatedSprite, Item
 from src.player import Player
-from src.groups import Sprites
+from src.groups import Sprites, CollisionSprites
+from src.spatial import TerrainGrid
+from src.chunks import TileBaker
 from src.enemies import SpikeBall
 from src.enemies import Tooth, Shell, Pearl
 from src.particle import Particle
+from src.animation import animation_clocks
 
 
 class Level:
     """Level of the game"""
-    def __init__(self, level_map, level_frames, data, switch, sounds):
-        """Initialize the level"""
+    def __init__(self, level_map, level_frames, data, switch, sounds, tiles=None):
+        """Initialize the level, the tiles can be already (or partially) baked by the baker from bake_tiles"""
         # Get the main surface
         self.surface = pygame.display.get_surface()
 
@@ -48,9 +52,13 @@ class Level:
                                {"small": level_frames["small_cloud"], "large": level_frames["large_cloud"]},
                                level_properties["horizon_line"], bg_tile, level_properties["top_limit"])
         # Sprites that collide
-        self.collision_sprites = pygame.sprite.Group()
+        self.collision_sprites = CollisionSprites()
         # Semi collision sprites
-        self.semi_collision_sprites = pygame.sprite.Group()
+        self.semi_collision_sprites = CollisionSprites()
+        # Moving platforms, that can carry the player
+        self.platform_sprites = CollisionSprites()
+        # Solid tiles of the terrain, from the collision grid compiled with the map
+        self.terrain = TerrainGrid(level_map.width, level_map.height, level_map.collision)
         # Sprites that deal damage
         self.damage_sprites = pygame.sprite.Group()
 
@@ -67,8 +75,16 @@ class Level:
         # Particle surfaces
         self.particle_frames = level_frames["particle"]
 
+        # Finish baking the static tiles, start it if they weren't prepared
+        if tiles is None:
+            tiles = self.bake_tiles(level_map)
+        tiles.bake()
+        self.sprites.add_chunks(tiles.chunks)
+
         # Initialize the level's map
         self._initialize(level_map, level_frames, sounds)
+        # Place the camera on the player
+        self.sprites.move_camera(self.player.hitbox_rect.topleft, True)
 
         # Get the sounds
         self.coin_sound = sounds["coin"]
@@ -80,24 +96,33 @@ class Level:
         self.damage_sound.set_volume(0.4)
         self.pearl_sound.set_volume(0.4)
 
-    def run(self, delta_time):
-        """Run the level"""
+    @staticmethod
+    def bake_tiles(level_map):
+        """Get the baker of the level's static tiles, background and foreground ones are in the background,
+        terrain and platforms in the main depth"""
+        return TileBaker(level_map, [("BG", settings.LAYERS_DEPTH["bg_tiles"]),
+                                     ("Terrain", settings.LAYERS_DEPTH["main"]),
+                                     ("FG", settings.LAYERS_DEPTH["bg_tiles"]),
+                                     ("Platforms", settings.LAYERS_DEPTH["main"])])
+
+    def update(self, delta_time):
+        """Update the level by a singular simulation step"""
         # Update the level elements
         self._update_pos(delta_time)
 
-        # Draw things
-        self._update_surface(delta_time)
-
-    def _update_surface(self, delta_time):
-        """Update level's surface"""
+    def draw(self, alpha, delta_time):
+        """Draw the level, in between the last two simulation steps"""
         # Clean the surface
         self.surface.fill("gray")
 
         # Draw all sprites
-        self.sprites.draw(self.player.hitbox_rect, delta_time)
+        self.sprites.draw(alpha)
 
     def _update_pos(self, delta_time):
         """Update position of all level elements"""
+        # Move the shared animations forward
+        animation_clocks.update(delta_time)
+
         # Update all the sprites
         self.sprites.update(delta_time)
 
@@ -115,43 +140,17 @@ class Level:
         # Constraint the player if needed
         self._check_constraints()
 
+        # Follow the player with the camera
+        self.sprites.move_camera(self.player.hitbox_rect.topleft)
+
     def _initialize(self, level_map, level_frames, sounds):
         """Initialize the map"""
 
-        # Go through each layer and import it
-        for layer in ["BG", "Terrain", "FG", "Platforms"]:
-            # Group list depending on the layer
-            groups = [self.sprites]
-
-            # If tile is a terrain, give it just collision group
-            if layer == "Terrain":
-                groups.append(self.collision_sprites)
-            # If it's a platform, make it semi collide-able
-            elif layer == "Platforms":
-                groups.append(self.semi_collision_sprites)
-
-            # Check for depth position based off layer type
-            # If it's a background tile, set it as one
-            if layer == "BG":
-                pos_z = settings.LAYERS_DEPTH["bg_tiles"]
-            # Set foreground as background
-            elif layer == "FG":
-                pos_z = settings.LAYERS_DEPTH["bg_tiles"]
-            # Otherwise just set it as main
-            else:
-                pos_z = settings.LAYERS_DEPTH["main"]
-
-            # Get every tile of the layer, place it on the map
-            for pos_x, pos_y, surface in level_map.get_layer_by_name(layer).tiles():
-                # Create the tile
-                Sprite((pos_x * settings.TILE_SIZE, pos_y * settings.TILE_SIZE),
-                       surface, groups, pos_z)
-
-        # Go through each terrain tiles and get its position as well as the surface
-        for pos_x, pos_y, surface in level_map.get_layer_by_name("Terrain").tiles():
-            # Create a new sprite with this data, convert the position from tiles to pixels
-            Sprite((pos_x * settings.TILE_SIZE, pos_y * settings.TILE_SIZE), surface,
-                   (self.sprites, self.collision_sprites))
+        # Make the platform tiles semi collide-able, the tiles are drawn from the baked chunks, so they aren't sprites
+        # (the terrain tiles are in the collision grid of the map)
+        for pos_x, pos_y, surface in level_map.get_layer_by_name("Platforms").tiles():
+            Sprite((pos_x * settings.TILE_SIZE, pos_y * settings.TILE_SIZE), surface, self.semi_collision_sprites,
+                   settings.LAYERS_DEPTH["main"])
 
         # Get background details from the file
         for obj in level_map.get_layer_by_name("BG details"):
@@ -172,8 +171,8 @@ class Level:
             # If this object is a player, create him
             if obj.name == "player":
                 self.player = Player((obj.x, obj.y), level_frames["player"], self.sprites,
-                                     self.collision_sprites, self.semi_collision_sprites, self.data,
-                                     sounds["attack"], sounds["jump"])
+                                     self.collision_sprites, self.semi_collision_sprites, self.platform_sprites,
+                                     self.terrain, self.data, sounds["attack"], sounds["jump"])
             # Otherwise, if the object is some tile
             else:
                 # Create a barrel or a crate, which aren't animated
@@ -192,7 +191,7 @@ class Level:
                     # Check if there are any inverted spikes
                     if obj.name == "floor_spike" and obj.properties["inverted"]:
                         # Invert all the frames
-                        frames = [pygame.transform.flip(frame, False, True) for frame in frames]
+                        frames = [utilities.flip(frame, False, True) for frame in frames]
 
                     # Prepare list of groups
                     groups = [self.sprites]
@@ -211,14 +210,14 @@ class Level:
                     else:
                         pos_z = settings.LAYERS_DEPTH["main"]
 
-                    # Choose an animation speed, if the object is a palm, increment change it a little
+                    # Choose an animation phase, if the object is a palm, move it a little so palms don't sway together
                     if "palm" not in obj.name:
-                        animation_speed = settings.ANIMATION_SPEED
+                        phase = 0
                     else:
-                        animation_speed = settings.ANIMATION_SPEED + uniform(-1, 1)
+                        phase = uniform(0, len(frames))
 
                     # Create an animated sprite
-                    AnimatedSprite((obj.x, obj.y), frames, groups, pos_z, animation_speed)
+                    AnimatedSprite((obj.x, obj.y), frames, groups, pos_z, settings.ANIMATION_SPEED, phase)
 
                 # If this is a flag, create finish level rectangle spot
                 if obj.name == "flag":
@@ -230,21 +229,16 @@ class Level:
             if obj.name == "spike":
                 SpikeBall((obj.x + obj.width / 2, obj.y + obj.height / 2), level_frames["spike_ball"],
                           (self.sprites, self.damage_sprites), obj.properties["radius"],
-                          obj.properties["speed"], obj.properties["start_angle"], obj.properties["end_angle"])
-                # Create its chain
-                for radius in range(0, obj.properties["radius"], 20):
-                    SpikeBall((obj.x + obj.width / 2, obj.y + obj.height / 2), level_frames["spike_chain"],
-                              self.sprites, radius, obj.properties["speed"],
-                              obj.properties["start_angle"], obj.properties["end_angle"],
-                              settings.LAYERS_DEPTH["bg_details"])
+                          obj.properties["speed"], obj.properties["start_angle"], obj.properties["end_angle"],
+                          level_frames["spike_chain"], self.sprites)
 
             else:
                 # Animation frames of moving objects
                 frames = level_frames[obj.name]
 
-                # If object is a platform, set it to semi collide-able one
+                # If object is a platform, set it to semi collide-able one, register it as a moving platform
                 if obj.properties["platform"]:
-                    groups = (self.sprites, self.semi_collision_sprites)
+                    groups = (self.sprites, self.semi_collision_sprites, self.platform_sprites)
                 # Otherwise make it a sprite that attacks the player
                 else:
                     groups = (self.sprites, self.damage_sprites)
@@ -302,7 +296,7 @@ class Level:
             if enemy.name == "tooth":
                 Tooth((enemy.x, enemy.y), level_frames["tooth"], (self.sprites, self.damage_sprites,
                                                                   self.tooth_sprites),
-                      self.collision_sprites)
+                      self.collision_sprites, self.terrain)
 
             # Create a Shell enemy
             if enemy.name == "shell":
@@ -345,12 +339,18 @@ class Level:
 
     def _pearl_collisions(self):
         """Check and handle pearl collisions"""
-        # Check if pearl collides with any of the collide-able sprites, if so destroy it
-        for sprite in self.collision_sprites:
-            collided = pygame.sprite.spritecollide(sprite, self.pearl_sprites, True)
-            # If there were any collisions, create a particle effect
-            if collided:
-                Particle(collided[0].rect.center, self.particle_frames, self.sprites)
+        # If there aren't any pearls, there is nothing to check
+        if not self.pearl_sprites:
+            return
+
+        # Go through each pearl
+        for pearl in self.pearl_sprites.sprites():
+            # Check if it hits the terrain or any of the collide-able sprites near it
+            if (self.terrain.collides(pearl.rect) or
+                    pearl.rect.collidelist([sprite.rect for sprite in self.collision_sprites.nearby(pearl.rect)]) >= 0):
+                # If so destroy it and create a particle effect
+                pearl.kill()
+                Particle(pearl.rect.center, self.particle_frames, self.sprites)
 
     def _damage_collisions(self):
         """Check and handle player's collisions with sprites that deal damage"""
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from threading import Lock, Thread
+from time import perf_counter
+
+from src.settings import settings
+from src.compiler import load_map
+
+
+class Maps:
+    """Maps of the game, loaded when they are needed for the first time and kept in a limited cache"""
+    def __init__(self, paths, size=settings.MAP_CACHE_SIZE, load=load_map):
+        """Prepare the maps"""
+        # Paths of the map files, stored by their names
+        self.paths = paths
+        # The biggest number of maps kept loaded, and the function that loads one
+        self.size = size
+        self.load = load
+
+        # Loaded maps, from the least recently used one
+        self.cache = OrderedDict()
+
+        # Threads that load maps in the background, stored by the map names
+        self.loading = {}
+        # Lock of the cache, the statistics and the loading threads
+        self.lock = Lock()
+
+        # Statistics of the cache, and the total time spent on loading in seconds
+        self.hits = 0
+        self.misses = 0
+        self.prefetches = 0
+        self.load_time = 0
+
+    def get(self, name):
+        """Get the map with the given name, load it if it isn't loaded"""
+        # If the map is being loaded in the background, wait for it
+        with self.lock:
+            thread = self.loading.get(name)
+        if thread:
+            thread.join()
+
+        with self.lock:
+            # If the map is loaded, mark it as the most recently used one and return it
+            if name in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(name)
+                return self.cache[name]
+
+            # Otherwise it needs to be loaded
+            self.misses += 1
+
+        # Load it and return it
+        return self._load(name)
+
+    def prefetch(self, name):
+        """Start loading the map in the background, if it isn't loaded or loading already"""
+        with self.lock:
+            if name in self.cache or name in self.loading:
+                return
+
+            # Create the loading thread, save it
+            thread = Thread(target=self._load, args=(name, True), daemon=True)
+            self.loading[name] = thread
+            self.prefetches += 1
+
+        thread.start()
+
+    def loaded(self, name):
+        """Check if the map is loaded, without waiting for it"""
+        with self.lock:
+            return name in self.cache and name not in self.loading
+
+    def stats(self):
+        """Get the statistics of the cache"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "prefetches": self.prefetches,
+                    "load_time": self.load_time, "loaded": len(self.cache)}
+
+    def _load(self, name, background=False):
+        """Load the map and store it in the cache, measure how long it takes"""
+        try:
+            start_time = perf_counter()
+            level_map = self.load(self.paths[name])
+
+            with self.lock:
+                self.load_time += perf_counter() - start_time
+
+                # Store the map as the most recently used one
+                self.cache[name] = level_map
+                self.cache.move_to_end(name)
+                # Forget the least recently used map if there are too many of them
+                if len(self.cache) > self.size:
+                    self.cache.popitem(last=False)
+
+            return level_map
+
+        # If it was loaded in the background, the thread doesn't load it anymore
+        finally:
+            if background:
+                with self.lock:
+                    del self.loading[name]
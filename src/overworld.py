@@ -6,11 +6,12 @@ from pygame.math import Vector2 as vector
 from src.settings import settings
 from src.sprites import Sprite, AnimatedSprite, Node, Icon, PathSprite
 from src.groups import WorldSprites
+from src.animation import animation_clocks
 
 
 class OverWorld:
     """Class representing game's overworld map"""
-    def __init__(self, overworld_map, data, frames, switch):
+    def __init__(self, overworld_map, data, frames, switch, prefetch):
         """Initialize the overworld"""
         # Get game's surface
         self.surface = pygame.display.get_surface()
@@ -20,17 +21,20 @@ class OverWorld:
 
         # Function to switch to a level
         self.switch = switch
+        # Function that starts loading the level's map in the background, before the player chooses it
+        self.prefetch = prefetch
 
-        # All sprites
-        self.sprites = WorldSprites(data)
+        # All sprites, drawn over the animated water
+        self.sprites = WorldSprites(data, frames["water"])
         # Group of node sprites
         self.node_sprites = pygame.sprite.Group()
 
         # Create the overworld
         self._initialize(overworld_map, frames)
 
-        # Current node the player's on (initialized to 0)
-        self.node = [node for node in self.node_sprites if node.level == 0][0]
+        # Current node the player's on, the icon starts at the node of the current level, prepare that level
+        self.node = [node for node in self.node_sprites if node.level == self.data.level][0]
+        self.prefetch(self.node.level)
 
         # Get path frames
         self.path_frames = frames["path"]
@@ -48,19 +52,12 @@ class OverWorld:
                 Sprite((pos_x * settings.TILE_SIZE, pos_y * settings.TILE_SIZE), surface, self.sprites,
                        settings.LAYERS_DEPTH["bg_tiles"])
 
-        # Fill the map with water
-        for row in range(overworld_map.height):
-            for column in range(overworld_map.width):
-                # Create an animated water sprite
-                AnimatedSprite((column * settings.TILE_SIZE, row * settings.TILE_SIZE), frames["water"],
-                               self.sprites, settings.LAYERS_DEPTH["bg"])
-
         # Place objects
         for obj in overworld_map.get_layer_by_name("Objects"):
-            # If object is a palm, place it as an animated sprite with a random animation speed
+            # If object is a palm, place it as an animated sprite with a random animation speed and phase
             if obj.name == "palm":
                 AnimatedSprite((obj.x, obj.y), frames["palm"], self.sprites, settings.LAYERS_DEPTH["main"],
-                               random.randint(3, 6))
+                               random.randint(3, 6), random.uniform(0, len(frames["palm"])))
             # Otherwise place the grass in the background details depth or other objects in background tiles layer
             else:
                 pos_z = settings.LAYERS_DEPTH[f'{"bg_details" if obj.name == "grass" else "bg_tiles"}']
@@ -102,29 +99,37 @@ class OverWorld:
                 Node((node.x, node.y), frames["path"]["node"], (self.sprites, self.node_sprites),
                      node.properties["stage"], self.data, available_paths)
 
-    def run(self, delta_time):
-        """Run the overworld"""
+    def update(self, delta_time):
+        """Update the overworld by a singular simulation step"""
         # Check and handle the input
         self._handle_input()
 
         # Update the positions
         self._update_positions(delta_time)
 
-        # Draw all the game elements
-        self._update_surface()
+    def draw(self, alpha, delta_time):
+        """Draw the overworld, in between the last two simulation steps"""
+        self._update_surface(alpha)
 
     def _update_positions(self, delta_time):
         """Update positions of the game elements"""
         # Get and change the current node
         self._change_node()
 
+        # Move the shared animations forward
+        animation_clocks.update(delta_time)
+
         # Update all sprites
         self.sprites.update(delta_time)
 
-    def _update_surface(self):
+    def _update_surface(self, alpha):
         """Update the surface"""
+        # Get the icon's position in between the steps, follow its center with the camera
+        pos = self.sprites.interpolate(self.icon, alpha)
+        target = pos + vector(self.icon.rect.center) - self.icon.rect.topleft
+
         # Draw the sprites
-        self.sprites.draw(self.icon.rect.center)
+        self.sprites.draw(target, alpha)
 
     def _handle_input(self):
         """Check and handle input"""
@@ -159,12 +164,17 @@ class OverWorld:
         # See if the path reverses (it has the 'r' character on the end)
         path_reverse = True if self.node.paths[direction][-1] == 'r' else False
 
-        # Get the path points by the earlier got key, if the path isn't reversed
+        # Get the path points by the earlier got key, if the path isn't reversed, it ends at the node of that level
         if not path_reverse:
             path = self.paths[path_key]["pos"][:]
-        # Otherwise get them reversed
+            target = path_key
+        # Otherwise get them reversed, they end at the start node
         else:
             path = self.paths[path_key]["pos"][::-1]
+            target = self.paths[path_key]["start"]
+
+        # Prepare the level that the player moves to
+        self.prefetch(target)
 
         # Finally move the player through the generated path
         self.icon.move(path)
@@ -176,6 +186,10 @@ class OverWorld:
 
         # If there were any collided nodes
         if nodes:
+            # If it's a different node, prepare its level
+            if nodes[0] is not self.node:
+                self.prefetch(nodes[0].level)
+
             # Set the player to the one he's on
             self.node = nodes[0]
 
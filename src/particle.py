@@ -1,12 +1,21 @@
-from src.sprites import AnimatedSprite
+from src.sprites import Sprite
 from src.settings import settings
 
 
-class Particle(AnimatedSprite):
+class Particle(Sprite):
     """Singular particle effect"""
+    # Particle disappears after its animation, so it can't sleep
+    always_active = True
+
     def __init__(self, pos, frames, group):
         """Initialize the particle"""
-        super().__init__(pos, frames, group)
+        # Animation frames, the current one and the animation speed (the animation plays only once)
+        self.frames = frames
+        self.frame = 0
+        self.animation_speed = 8
+
+        # Initialize the sprite with the first frame
+        super().__init__(pos, self.frames[self.frame], group)
 
         # Center the particle
         self.rect.center = pos
@@ -24,3 +33,7 @@ class Particle(AnimatedSprite):
         # Otherwise kill the particle
         else:
             self.kill()
+
+    def update(self, delta_time):
+        """Update the particle"""
+        self._animate(delta_time)
@@ -3,15 +3,20 @@ import math
 import pygame
 from pygame.math import Vector2 as vector
 
-from src.timer import Timer
+from src.timer import Timer, scheduler
 from src.utilities import utilities
 from src.settings import settings
 
 
 class Player(pygame.sprite.Sprite):
     """The player character of the game"""
-    def __init__(self, pos, frames, group, collision_sprites, semi_collision_sprites, data,
-                 attack_sound, jump_sound):
+    # Player moves, so groups can't keep him in a static place
+    dynamic = True
+    # The camera follows the player, he is always updated
+    always_active = True
+
+    def __init__(self, pos, frames, group, collision_sprites, semi_collision_sprites, platform_sprites, terrain,
+                 data, attack_sound, jump_sound):
         """Initialize the player"""
         super().__init__(group)
 
@@ -25,6 +30,12 @@ class Player(pygame.sprite.Sprite):
         self.frames = frames
         self.frame = 0
 
+        # Prepare silhouettes of every frame, normal and flipped, so flickering doesn't have to create them
+        for surfaces in self.frames.values():
+            for surface in surfaces:
+                utilities.silhouette(surface)
+                utilities.silhouette(utilities.flip(surface, True, False))
+
         # His current state
         self.state = "idle"
         # Flip player horizontally flag
@@ -75,6 +86,10 @@ class Player(pygame.sprite.Sprite):
         self.collision_sprites = collision_sprites
         # Semi collisions sprites, that player can only collide with on top of them
         self.semi_collision_sprites = semi_collision_sprites
+        # Moving platforms, that can carry the player
+        self.platform_sprites = platform_sprites
+        # Grid of solid terrain tiles
+        self.terrain = terrain
 
         # Platform that player's on
         self.platform = None
@@ -92,9 +107,6 @@ class Player(pygame.sprite.Sprite):
         # Store last player's rectangle
         self.last_rect = self.hitbox_rect.copy()
 
-        # Update time on timers
-        self._update_timers()
-
         # Handle input
         self._input()
 
@@ -214,38 +226,44 @@ class Player(pygame.sprite.Sprite):
 
     def _check_collisions(self, direction):
         """Check and handle collisions"""
-        # Go through each sprite that can collide
-        for sprite in self.collision_sprites:
+        # Get the solid terrain tiles near the player, they don't move, so their last rectangles are the same
+        colliders = [(rect, rect, False) for rect in self.terrain.rects(self.hitbox_rect)]
+        # Add the sprites that can collide and are near the player, check if they are moving platforms
+        colliders += [(sprite.rect, sprite.last_rect, hasattr(sprite, "move"))
+                      for sprite in self.collision_sprites.nearby(self.hitbox_rect)]
+
+        # Go through each of them
+        for rect, last_rect, moving in colliders:
             # If there is a collision, handle it
-            if sprite.rect.colliderect(self.hitbox_rect):
+            if rect.colliderect(self.hitbox_rect):
                 # Handle horizontal collisions if requested
                 if direction == "horizontal":
                     # If player collides with object to the right and was to the right of it in the last frame
-                    if (self.hitbox_rect.left <= sprite.rect.right and int(self.last_rect.left)
-                            >= int(sprite.last_rect.right)):
+                    if (self.hitbox_rect.left <= rect.right and int(self.last_rect.left)
+                            >= int(last_rect.right)):
                         # Hug him to it
-                        self.hitbox_rect.left = sprite.rect.right
+                        self.hitbox_rect.left = rect.right
 
                     # Do the same for the left side
-                    if (self.hitbox_rect.right >= sprite.rect.left and int(self.last_rect.right)
-                            <= int(sprite.last_rect.left)):
-                        self.hitbox_rect.right = sprite.rect.left
+                    if (self.hitbox_rect.right >= rect.left and int(self.last_rect.right)
+                            <= int(last_rect.left)):
+                        self.hitbox_rect.right = rect.left
 
                 # Otherwise handle vertical collisions
                 else:
                     # Check for top collision, don't allow the player to pass through the collision sprite
-                    if (self.hitbox_rect.top <= sprite.rect.bottom and int(self.last_rect.top)
-                            >= int(sprite.last_rect.bottom)):
-                        self.hitbox_rect.top = sprite.rect.bottom
+                    if (self.hitbox_rect.top <= rect.bottom and int(self.last_rect.top)
+                            >= int(last_rect.bottom)):
+                        self.hitbox_rect.top = rect.bottom
                         # If platform that player's collides with is moving, push him down a little, so he doesn't
                         # Stick to it
-                        if hasattr(sprite, "move"):
+                        if moving:
                             self.hitbox_rect.top += 6
 
                     # Check for bottom collision, make the player stand on the other sprite
-                    if (self.hitbox_rect.bottom >= sprite.rect.top and int(self.last_rect.bottom)
-                            <= int(sprite.last_rect.top)):
-                        self.hitbox_rect.bottom = sprite.rect.top
+                    if (self.hitbox_rect.bottom >= rect.top and int(self.last_rect.bottom)
+                            <= int(last_rect.top)):
+                        self.hitbox_rect.bottom = rect.top
 
                     # Reset the vertical direction, so the gravity doesn't increase constantly
                     self.direction.y = 0
@@ -253,8 +271,8 @@ class Player(pygame.sprite.Sprite):
     def _check_semi_collisions(self):
         """Check semi collisions with player"""
         if not self.timers["platform_skip"].active:
-            # Go through each semi collision sprites
-            for sprite in self.semi_collision_sprites:
+            # Go through each semi collision sprites near the player
+            for sprite in self.semi_collision_sprites.nearby(self.hitbox_rect):
                 # Check if they collide with the player
                 if sprite.rect.colliderect(self.hitbox_rect):
                     # If so, let the player stay on them
@@ -273,10 +291,14 @@ class Player(pygame.sprite.Sprite):
         right_rect = pygame.Rect(self.hitbox_rect.topright + vector(0, self.hitbox_rect.height / 4), (2, self.hitbox_rect.height / 2))
         left_rect = pygame.Rect(self.hitbox_rect.topleft + vector(-2, self.hitbox_rect.height / 4), (2, self.hitbox_rect.height / 2))
 
-        # Check if there were any collisions with collide-able sprites
-        collide_rects = [sprite.rect for sprite in self.collision_sprites]
+        # Get the area around the player, that contains all the contact rectangles
+        contact_area = self.hitbox_rect.inflate(6, 6)
+
+        # Check if there were any collisions with solid terrain and collide-able sprites near the player
+        collide_rects = (self.terrain.rects(contact_area)
+                         + [sprite.rect for sprite in self.collision_sprites.nearby(contact_area)])
         # Check for semi collide sprites and get their rectangles
-        semi_collide_rect = [sprite.rect for sprite in self.semi_collision_sprites]
+        semi_collide_rect = [sprite.rect for sprite in self.semi_collision_sprites.nearby(contact_area)]
 
         # If there were any with player's bottom rectangle, set down collisions flag to True
         self.collisions["down"] = True if (down_rect.collidelist(collide_rects) >= 0
@@ -288,16 +310,10 @@ class Player(pygame.sprite.Sprite):
         # Check and set left ones
         self.collisions["left"] = True if left_rect.collidelist(collide_rects) >= 0 else False
 
-        # Reset the platform that player's on
-        self.platform = None
-        # Add the collision sprites to the semi collision ones
-        all_sprites = self.collision_sprites.sprites() + self.semi_collision_sprites.sprites()
-
-        # Go through each colliding sprite that has the attribute move (platforms do)
-        for sprite in [sprite for sprite in all_sprites if hasattr(sprite, "move")]:
-            # If this sprite collides with player, set his platform to this one
-            if sprite.rect.colliderect(down_rect):
-                self.platform = sprite
+        # Get the moving platforms that collide with player's bottom rectangle
+        platforms = self.platform_sprites.nearby(down_rect)
+        # Set his platform to the last one of them, or reset it if there aren't any
+        self.platform = platforms[-1] if platforms else None
 
     def _attack(self):
         """Make the player attack"""
@@ -320,11 +336,6 @@ class Player(pygame.sprite.Sprite):
         if self.platform:
             self.hitbox_rect.topleft += self.platform.direction * self.platform.speed * delta_time
 
-    def _update_timers(self):
-        """Update all the timers"""
-        for timer in self.timers.values():
-            timer.update()
-
     def handle_damage(self):
         """Handle getting damage"""
         # If the hit cooldown has passed
@@ -338,13 +349,9 @@ class Player(pygame.sprite.Sprite):
     def _flicker(self):
         """Flicker the player's image"""
         # If player was hit, make him flicker and if current sinus is greater than 0 (for flicker effect)
-        if self.timers["hit"].active and math.sin(pygame.time.get_ticks() / 30) >= 0:
-            # Create a white mask in the player's shape
-            mask_surface = pygame.mask.from_surface(self.image).to_surface()
-            # Hide the black borders
-            mask_surface.set_colorkey("black")
-            # Apply it to the image
-            self.image = mask_surface
+        if self.timers["hit"].active and math.sin(scheduler.time() / 30) >= 0:
+            # Apply the white silhouette of player's shape to the image
+            self.image = utilities.silhouette(self.image)
 
     def _update_state(self):
         """Update the player's state"""
@@ -381,9 +388,9 @@ class Player(pygame.sprite.Sprite):
         # Change player's image based off the frame
         self.image = self.frames[self.state][int(self.frame % len(self.frames[self.state]))]
 
-        # If player is facing left, flip his image horizontally
+        # If player is facing left, use the horizontally flipped image
         if self.flip:
-            self.image = pygame.transform.flip(self.image, True, False)
+            self.image = utilities.flip(self.image, True, False)
 
         # If player is attacking and the frames ended, set the attack flag back to False
         if self.attack and self.frame >= len(self.frames[self.state]):
@@ -14,6 +14,23 @@ class Settings:
 
         # Singular tile size
         self.TILE_SIZE = 64
+        # Size of chunks that static tiles are baked into, in tiles (8 tiles of 64 pixels make a 1 MB chunk)
+        self.CHUNK_SIZE = 8
+
+        # Frames per second limit of the rendering (0 doesn't limit it)
+        self.FPS = 60
+        # Simulation steps per second, the game always updates with the same delta time
+        self.SIMULATION_RATE = 60
+        # Longest frame time that is simulated, so a single hitch doesn't cause too many steps
+        self.MAX_FRAME_TIME = 0.25
+
+        # Distance around the camera in pixels, in which sprites are updated (further ones sleep)
+        self.ACTIVITY_MARGIN = 256
+
+        # Number of maps kept loaded, the least recently used ones are loaded again when needed
+        self.MAP_CACHE_SIZE = 3
+        # Time in seconds that each frame can spend on preparing the next level
+        self.PREPARE_TIME = 0.004
 
         # Animation settings
         self.ANIMATION_SPEED = 5
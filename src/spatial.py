@@ -0,0 +1,152 @@
+import math
+
+import pygame
+
+from src.settings import settings
+
+
+class SpatialGrid:
+    """Uniform grid that stores sprites in the cells their rectangles occupy"""
+    def __init__(self, cell_size=settings.TILE_SIZE):
+        """Initialize the grid"""
+        # Size of a singular cell in pixels
+        self.cell_size = cell_size
+
+        # Sprites stored in each cell
+        self.cells = {}
+        # Cells that each of the static sprites occupy
+        self.sprite_cells = {}
+
+        # Sprites that move, they are checked separately instead of being stored in cells
+        self.dynamic = {}
+
+        # Order in which sprites were added, used to keep the drawing order of the group
+        self.order = {}
+        self.count = 0
+
+    def add(self, sprite):
+        """Add the sprite to the grid"""
+        # Save the order of the sprite
+        self.order[sprite] = self.count
+        self.count += 1
+
+        # If the sprite moves, store it separately
+        if getattr(sprite, "dynamic", False):
+            self.dynamic[sprite] = None
+        # Otherwise place it in every cell it occupies
+        else:
+            cells = self._get_cells(sprite.rect)
+            self.sprite_cells[sprite] = cells
+
+            # Store the sprite in each of them
+            for cell in cells:
+                self.cells.setdefault(cell, {})[sprite] = None
+
+    def remove(self, sprite):
+        """Remove the sprite from the grid"""
+        # Forget the order of it
+        self.order.pop(sprite, None)
+
+        # Remove it from moving sprites
+        self.dynamic.pop(sprite, None)
+
+        # Remove it from every cell it was in
+        for cell in self.sprite_cells.pop(sprite, ()):
+            del self.cells[cell][sprite]
+
+    def move(self, sprite):
+        """Place the static sprite in the cells of its new rectangle, after it was moved"""
+        # Get the cells that it occupies now, if they didn't change, there is nothing to do
+        cells = self._get_cells(sprite.rect)
+        if cells == self.sprite_cells[sprite]:
+            return
+
+        # Remove it from the old cells and store it in the new ones
+        for cell in self.sprite_cells[sprite]:
+            del self.cells[cell][sprite]
+        for cell in cells:
+            self.cells.setdefault(cell, {})[sprite] = None
+        self.sprite_cells[sprite] = cells
+
+    def __len__(self):
+        """Get the amount of sprites in the grid"""
+        return len(self.order)
+
+    def query(self, rect):
+        """Get sprites that are near the given rectangle, in the order they were added"""
+        # Found sprites
+        found = {}
+        # Go through each cell the rectangle is in, save the sprites from it
+        for cell in self._get_cells(rect):
+            if cell in self.cells:
+                found.update(self.cells[cell])
+
+        # Add moving sprites that collide with the rectangle
+        for sprite in self.dynamic:
+            if sprite.rect.colliderect(rect):
+                found[sprite] = None
+
+        # Return the sprites sorted by the order they were added
+        return sorted(found, key=self.order.__getitem__)
+
+    def _get_cells(self, rect):
+        """Get cells that the rectangle occupies"""
+        # Calculate the first and the last column and row of the rectangle
+        left = int(rect.left // self.cell_size)
+        right = int(rect.right // self.cell_size)
+        top = int(rect.top // self.cell_size)
+        bottom = int(rect.bottom // self.cell_size)
+
+        # Return every cell between them
+        return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+
+class TerrainGrid:
+    """Grid that stores which tiles of the static terrain are solid"""
+    def __init__(self, width, height, solid=None, tile_size=settings.TILE_SIZE):
+        """Prepare the grid, empty or with the given solid flags"""
+        # Dimensions of the grid in tiles
+        self.width = width
+        self.height = height
+        # Size of a singular tile in pixels
+        self.tile_size = tile_size
+
+        # Solid flag of every tile, stored row after row (a copy, so changing the grid doesn't change the given flags)
+        self.solid = bytearray(solid) if solid else bytearray(width * height)
+        # Version of the grid, that changes every time a tile changes
+        self.version = 0
+
+    def set_solid(self, column, row, solid=True):
+        """Set the tile as solid or empty"""
+        self.solid[row * self.width + column] = solid
+        # Change the version
+        self.version += 1
+
+    def is_solid(self, column, row):
+        """Check if the tile is solid, tiles outside the grid are empty"""
+        # Return False when the tile is out of grid
+        if not (0 <= column < self.width and 0 <= row < self.height):
+            return False
+
+        return bool(self.solid[row * self.width + column])
+
+    def rects(self, rect):
+        """Get rectangles of all solid tiles that collide with the given rectangle, row after row"""
+        # Get the normalized rectangle (it can have negative dimensions)
+        rect = rect.copy()
+        rect.normalize()
+
+        # Calculate the first and the last column and row that the rectangle overlaps
+        left = max(int(rect.left // self.tile_size), 0)
+        right = min(math.ceil(rect.right / self.tile_size), self.width)
+        top = max(int(rect.top // self.tile_size), 0)
+        bottom = min(math.ceil(rect.bottom / self.tile_size), self.height)
+
+        # Return rectangle of every solid tile between them
+        return [pygame.FRect(column * self.tile_size, row * self.tile_size, self.tile_size, self.tile_size)
+                for row in range(top, bottom) for column in range(left, right)
+                if self.solid[row * self.width + column]]
+
+    def collides(self, rect):
+        """Check if the rectangle collides with any solid tile"""
+        return bool(self.rects(rect))
@@ -1,9 +1,9 @@
-import random
-
 import pygame.sprite
 from pygame.math import Vector2 as vector
 
 from src.settings import settings
+from src.utilities import utilities
+from src.animation import animation_clocks
 
 
 class Sprite(pygame.sprite.Sprite):
@@ -26,34 +26,39 @@ class Sprite(pygame.sprite.Sprite):
 
 
 class AnimatedSprite(Sprite):
-    """Sprite that is animated"""
-    def __init__(self, pos, frames, group, pos_z=settings.LAYERS_DEPTH["main"], animation_speed=8, ):
+    """Sprite that is animated by a clock shared with every sprite that has the same frames and speed"""
+    def __init__(self, pos, frames, group, pos_z=settings.LAYERS_DEPTH["main"], animation_speed=8, phase=0):
         """Initialized the animated sprite"""
         # Animation frames
         self.frames = frames
-        # Current frame
-        self.frame = 0
-
-        # Initialize the parent Sprite with the first frame
-        super().__init__(pos, self.frames[self.frame], group, pos_z)
-
         # Speed of the animation
         self.animation_speed = animation_speed
 
-    def _animate(self, delta_time):
-        """Animate the sprite"""
-        # Increase the current frame
-        self.frame += self.animation_speed * delta_time
-        # Update the image based off the frame
-        self.image = self.frames[int(self.frame % len(self.frames))]
+        # Clock that animates the sprite, and how many frames the sprite is ahead of it
+        self.clock = animation_clocks.get(frames, animation_speed)
+        self.phase = phase
 
-    def update(self, delta_time):
-        """Update the animation"""
-        self._animate(delta_time)
+        # Initialize the pygame's sprite (the image comes from the clock, so it isn't set like in the parent Sprite)
+        pygame.sprite.Sprite.__init__(self, group)
+
+        # Get its rectangle from the first frame, and a copy of it for collisions
+        self.rect = self.frames[0].get_frect(topleft=pos)
+        self.last_rect = self.rect.copy()
+
+        # Depth position of the sprite
+        self.pos_z = pos_z
+
+    @property
+    def image(self):
+        """Get the current frame of the animation"""
+        return self.clock.get_image(self.phase)
 
 
 class MovingSprite(AnimatedSprite):
     """Sprite that can move"""
+    # The sprite moves, so groups can't keep it in a static place
+    dynamic = True
+
     def __init__(self, start_pos, end_pos, frames, direction, speed, group, flip=False):
         """Initialize the sprite"""
         # Initialize the general sprite
@@ -95,16 +100,29 @@ class MovingSprite(AnimatedSprite):
         # Bounce it if needed
         self._bounce()
 
-        # Anime the sprite
-        self._animate(delta_time)
-        # Flip the image when in need
-        self._flip()
-
-    def _flip(self):
-        """Flip the animation if needed"""
-        # Flip the image when flag is true, by using the prepared dictionary
+    @property
+    def image(self):
+        """Get the current frame of the animation, flipped when in need"""
+        # Get the flipped image when flag is true, by using the prepared dictionary
         if self.flip:
-            self.image = pygame.transform.flip(self.image, self.flip_directions['x'], self.flip_directions['y'])
+            return utilities.flip(self.clock.get_image(self.phase), self.flip_directions['x'],
+                                  self.flip_directions['y'])
+
+        return self.clock.get_image(self.phase)
+
+    def catch_up(self, elapsed):
+        """Catch up the position after sleeping for the elapsed time"""
+        # Get the distance it would travel, bounce it through its way
+        distance = self.speed * elapsed
+        if self.move_type == 'x':
+            self.rect.left, self.direction.x = utilities.bounce(self.rect.left, self.direction.x, self.start_pos[0],
+                                                                self.end_pos[0] - self.rect.width, distance)
+        else:
+            self.rect.top, self.direction.y = utilities.bounce(self.rect.top, self.direction.y, self.start_pos[1],
+                                                               self.end_pos[1] - self.rect.height, distance)
+
+        # It didn't move during the sleep, so there is nothing to collide with on the way
+        self.last_rect = self.rect.copy()
 
     def _bounce(self):
         """Bounce the sprite when reaching starting and ending positions"""
@@ -174,30 +192,6 @@ class Item(AnimatedSprite):
                 self.data.coins += 10
 
 
-class Cloud(Sprite):
-    """Cloud that moves"""
-    def __init__(self, pos, surface, group, pos_z=settings.LAYERS_DEPTH["clouds"]):
-        """Initialize the cloud"""
-        super().__init__(pos, surface, group, pos_z)
-
-        # Choose a random cloud speed
-        self.speed = random.randint(50, 120)
-        # Cloud's direction
-        self.direction = -1
-
-        # Center the cloud
-        self.rect.midbottom = pos
-
-    def update(self, delta_time):
-        """Update the cloud's position"""
-        # Move the cloud
-        self.rect.x += self.direction * self.speed * delta_time
-
-        # If cloud behind the left border of the game, delete it
-        if self.rect.right <= 0:
-            self.kill()
-
-
 class Node(pygame.sprite.Sprite):
     """Class representing a node in the overworld"""
     def __init__(self, pos, surface, group, level, data, paths):
@@ -231,6 +225,9 @@ class Node(pygame.sprite.Sprite):
 
 class Icon(pygame.sprite.Sprite):
     """Icon on the overworld map"""
+    # Icon travels through paths, so it's a moving sprite
+    dynamic = True
+
     def __init__(self, pos, frames, group):
         """Initialize the icon"""
         super().__init__(group)
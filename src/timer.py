@@ -1,6 +1,69 @@
+from heapq import heappush, heappop
+
 from pygame.time import get_ticks
 
 
+class Scheduler:
+    """Keeps the active timers in order of their end, expires them only when they are due"""
+    def __init__(self, clock=get_ticks):
+        """Initialize the scheduler"""
+        # Function that returns the current time in milliseconds
+        self.clock = clock
+
+        # Queue of the active timers, stored with their end time, order and start number
+        self.queue = []
+        # Number of the timers added, keeps the order of ones that end at the same time
+        self.count = 0
+
+    def reset(self, clock=get_ticks):
+        """Throw away the queued timers and use the given clock from now, for a new game"""
+        self.clock = clock
+        self.queue = []
+        self.count = 0
+
+    def time(self):
+        """Get the current time in milliseconds"""
+        return self.clock()
+
+    def add(self, timer):
+        """Add the started timer to the queue"""
+        heappush(self.queue, (timer.start_time + timer.duration, self.count, timer, timer.starts))
+        self.count += 1
+
+    def update(self):
+        """Expire every timer that is due"""
+        # Get the current time
+        current_time = self.clock()
+
+        # Go through each timer that has already ended
+        while self.queue and self.queue[0][0] <= current_time:
+            end_time, order, timer, starts = heappop(self.queue)
+
+            # If the timer wasn't stopped or started again since it was added, expire it
+            if timer.active and timer.starts == starts:
+                timer.expire()
+
+
+class VirtualClock:
+    """Clock that moves only when it's told to, so the game can run faster than the real time"""
+    def __init__(self):
+        """Initialize the clock"""
+        # Current time in milliseconds
+        self.ticks = 0
+
+    def __call__(self):
+        """Get the current time in milliseconds"""
+        return self.ticks
+
+    def advance(self, delta_time):
+        """Move the time forward by the delta time in seconds"""
+        self.ticks += delta_time * 1000
+
+
+# Scheduler of every timer in the game
+scheduler = Scheduler()
+
+
 class Timer:
     """Simple timer class"""
     def __init__(self, duration, function=None, loops=False):
@@ -11,6 +74,8 @@ class Timer:
         self.start_time = 0
         # Active flag
         self.active = False
+        # Number of times it was started, so the scheduler can skip the outdated starts
+        self.starts = 0
 
         # Repeat flag
         self.loops = loops
@@ -23,7 +88,11 @@ class Timer:
         # Set the active flag to true
         self.active = True
         # Get the start time to count duration
-        self.start_time = get_ticks()
+        self.start_time = scheduler.time()
+
+        # Let the scheduler expire it when it ends
+        self.starts += 1
+        scheduler.add(self)
 
     def stop(self):
         """Stop the timer"""
@@ -35,15 +104,10 @@ class Timer:
         if self.loops:
             self.start()
 
-    def update(self):
-        """Update time on the timer"""
-        # Get the current time
-        current_time = get_ticks()
-
-        # Calculate and check if duration has already passed from the start time
-        if current_time - self.start_time >= self.duration:
-            # If the timer was on and a function was given, call it
-            if self.function and self.start_time != 0:
-                self.function()
-            # Stop the timer
-            self.stop()
+    def expire(self):
+        """End the timer after its duration passed"""
+        # If a function was given, call it
+        if self.function:
+            self.function()
+        # Stop the timer
+        self.stop()
@@ -3,7 +3,7 @@ import random
 import pygame
 
 from src.settings import settings
-from src.sprites import AnimatedSprite
+from src.sprites import Sprite
 from src.timer import Timer
 
 
@@ -37,16 +37,11 @@ class UI:
 
     def update(self, delta_time):
         """Update the user's interface icons and text"""
-        # Update coin timer
-        self.coin_duration.update()
-
         # Update all the sprites
         self.sprites.update(delta_time)
 
-        # Draw the sprites
-        self.sprites.draw(self.surface)
-        # Draw all text
-        self._show_text()
+        # Draw the hearts and all the text at once
+        self.surface.fblits([(heart.image, heart.rect.topleft) for heart in self.sprites] + self._get_text())
 
     def create_hearts(self, count):
         """Create hearts to indicate player's lives"""
@@ -62,8 +57,8 @@ class UI:
             # Create the heart
             Heart((pos_x, pos_y), self.health_frames, self.sprites)
 
-    def _show_text(self):
-        """Show all UI texts"""
+    def _get_text(self):
+        """Get all UI texts with their positions, ready to blit"""
         # Show the text, if coin timer is active
         if self.coin_duration.active:
             # Render the text
@@ -71,13 +66,14 @@ class UI:
             # Get its rectangle, set its position to top left with a little margin
             text_rect = text_surface.get_frect(topleft=(16, 34))
 
-            # Blit the text
-            self.surface.blit(text_surface, text_rect)
-
             # Create rectangle for displaying coin surface
             coin_rect = self.coin_surface.get_frect(center=text_rect.bottomleft)
-            # Display the coin surface
-            self.surface.blit(self.coin_surface, coin_rect)
+
+            # Return the text and the coin surface
+            return [(text_surface, text_rect.topleft), (self.coin_surface, coin_rect.topleft)]
+
+        # Otherwise there isn't anything to show
+        return []
 
     def update_coins(self, amount):
         """Update amount of coins currently displayed"""
@@ -87,11 +83,15 @@ class UI:
         self.coin_duration.start()
 
 
-class Heart(AnimatedSprite):
+class Heart(Sprite):
     """Class representing a heart used to show player's health"""
     def __init__(self, pos, frames, group):
         """Create heart properties"""
-        super().__init__(pos, frames, group)
+        # Animation frames and the current one (the animation plays only once in a while)
+        self.frames = frames
+        self.frame = 0
+
+        super().__init__(pos, self.frames[self.frame], group)
 
         # Animation active flag
         self.active = False
@@ -12,6 +12,13 @@ class Utilities:
         # Get file base path
         self.base_path = settings.BASE_PATH
 
+        # Flipped versions of surfaces, stored by the surface and the flip directions
+        self.flipped = {}
+        # White silhouettes of surfaces, used for hit effects
+        self.silhouettes = {}
+        # Surfaces repeated over bigger ones, stored by the surface and the size
+        self.tiled = {}
+
     def load(self, path, alpha=True):
         """Load an image from absolute path"""
         # If user wants to convert alpha, do it
@@ -35,6 +42,11 @@ class Utilities:
                 # Append it to the frames list after converting alpha
                 frames.append(pygame.image.load(full_path).convert_alpha())
 
+        # Prepare the flipped versions of the frames, so animations don't need to flip them every frame
+        for frame in frames:
+            self.flip(frame, True, False)
+            self.flip(frame, False, True)
+
         # Return the ready list
         return frames
 
@@ -55,6 +67,65 @@ class Utilities:
 
         return frames_dict
 
+    def flip(self, surface, flip_x, flip_y):
+        """Get the surface flipped in the given directions, flip each surface only once"""
+        # If there isn't anything to flip, return the surface itself
+        if not flip_x and not flip_y:
+            return surface
+
+        # If this version wasn't created yet, flip the surface and save it
+        if (surface, flip_x, flip_y) not in self.flipped:
+            self.flipped[(surface, flip_x, flip_y)] = pygame.transform.flip(surface, flip_x, flip_y)
+
+        # Return the flipped surface
+        return self.flipped[(surface, flip_x, flip_y)]
+
+    def silhouette(self, surface):
+        """Get a white silhouette in the surface's shape, create each one only once"""
+        # If it wasn't created yet, do it
+        if surface not in self.silhouettes:
+            # Create a white mask in the surface's shape
+            mask_surface = pygame.mask.from_surface(surface).to_surface()
+            # Hide the black borders
+            mask_surface.set_colorkey("black")
+            # Save it
+            self.silhouettes[surface] = mask_surface
+
+        # Return the silhouette
+        return self.silhouettes[surface]
+
+    def tile(self, surface, width, height):
+        """Get the surface repeated over a new one of the given size, create each one only once"""
+        # If it wasn't created yet, do it
+        if (surface, width, height) not in self.tiled:
+            # Create the surface, fill it with the given one in every column and row
+            tiled_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            tiled_surface.fblits([(surface, (pos_x, pos_y)) for pos_x in range(0, width, surface.get_width())
+                                  for pos_y in range(0, height, surface.get_height())])
+            # Save it
+            self.tiled[(surface, width, height)] = tiled_surface
+
+        # Return the tiled surface
+        return self.tiled[(surface, width, height)]
+
+    def bounce(self, value, direction, start, end, distance):
+        """Move the value by the distance, bouncing between the start and the end, return it with its direction"""
+        # Length of the way between the start and the end
+        length = end - start
+        # If there isn't any, stay at the start
+        if length <= 0:
+            return start, direction
+
+        # Get the distance from the start, as if the way to the end and back was a circle, move through it
+        travelled = value - start if direction > 0 else 2 * length - (value - start)
+        travelled = (travelled + distance) % (2 * length)
+
+        # If it's still on the way to the end, move forward
+        if travelled < length:
+            return start + travelled, 1
+        # Otherwise it's on the way back
+        return start + 2 * length - travelled, -1
+
     def load_subfolders(self, path):
         """Load subfolders from the given path, store them in a dictionary"""
         frames_dict = {}
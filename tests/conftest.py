@@ -0,0 +1,9 @@
+import pytest
+
+from main import Game
+
+
+@pytest.fixture(scope="session")
+def game():
+    """Headless game, shared by the tests, since loading the assets takes a while"""
+    return Game(headless=True, seed=0)
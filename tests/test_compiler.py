@@ -0,0 +1,121 @@
+import os
+import pickle
+import shutil
+import zlib
+
+import pytest
+
+from src import compiler
+from src.settings import settings
+from src.compiler import compile_map, load_map, CompiledMap
+
+
+LEVELS = os.path.join(settings.BASE_PATH, "../data/levels")
+
+
+@pytest.mark.parametrize("reverse", (False, True))
+def test_empty_tileset_is_skipped_when_it_shares_the_first_id(game, reverse):
+    """Level 1 has the empty enemies tileset and the grass tileset at the same first id"""
+    data = compile_map(os.path.join(LEVELS, "1.tmx"))
+    first_gids = {os.path.basename(tileset["image"] or ""): tileset["first_gid"] for tileset in data["tilesets"]}
+    if reverse:
+        data["tilesets"].reverse()
+
+    image = CompiledMap(data, LEVELS).get_image(first_gids["grass.png"])
+
+    assert image.get_size() == (64, 64)
+
+
+@pytest.fixture
+def level_path(tmp_path):
+    """Copy of level 0 and the tilesets it uses, that the tests can change"""
+    (tmp_path / "levels").mkdir()
+    shutil.copytree(os.path.join(LEVELS, "../tilesets"), tmp_path / "tilesets")
+    shutil.copy(os.path.join(LEVELS, "0.tmx"), tmp_path / "levels")
+    return str(tmp_path / "levels" / "0.tmx")
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    """Paths of the maps that were compiled"""
+    paths = []
+
+    def counted_compile(path):
+        paths.append(path)
+        return compile_map(path)
+    monkeypatch.setattr(compiler, "compile_map", counted_compile)
+    return paths
+
+
+def test_map_is_compiled_once(level_path, compiles):
+    load_map(level_path)
+    load_map(level_path)
+
+    assert compiles == [level_path]
+    assert os.path.exists(level_path.replace(".tmx", ".lvl"))
+
+
+def test_map_is_compiled_again_when_it_changes(level_path, compiles):
+    load_map(level_path)
+    with open(level_path, "a") as file:
+        file.write("\n")
+    load_map(level_path)
+
+    assert compiles == [level_path, level_path]
+
+
+def test_map_is_compiled_again_when_its_tileset_changes(level_path, compiles):
+    load_map(level_path)
+    with open(os.path.join(os.path.dirname(level_path), "../tilesets/grass.tsx"), "a") as file:
+        file.write("\n")
+    load_map(level_path)
+
+    assert compiles == [level_path, level_path]
+
+
+def test_map_of_an_older_format_is_compiled_again(level_path, compiles):
+    with open(level_path.replace(".tmx", ".lvl"), "wb") as file:
+        file.write(compiler.PREFIX.pack(compiler.MAGIC, compiler.FORMAT_VERSION - 1) + zlib.compress(b"{}"))
+    load_map(level_path)
+
+    assert compiles == [level_path]
+
+
+def test_pickled_map_is_compiled_again_without_unpickling_it(level_path, compiles):
+    with open(level_path.replace(".tmx", ".lvl"), "wb") as file:
+        pickle.dump(compile_map(level_path), file)
+    compiles.clear()
+    load_map(level_path)
+
+    assert compiles == [level_path]
+
+
+def test_saved_map_loads_the_same_map(level_path):
+    compiled = CompiledMap(compile_map(level_path), os.path.dirname(level_path))
+    load_map(level_path)
+    loaded = load_map(level_path)
+
+    assert loaded.collision == compiled.collision
+    for name, layer in compiled.layers.items():
+        if isinstance(layer, list):
+            assert [vars(obj) | {"map": None} for obj in loaded.layers[name]] == \
+                   [vars(obj) | {"map": None} for obj in layer]
+        else:
+            assert loaded.layers[name].gids == layer.gids
+            assert loaded.layers[name].chunk_tiles == layer.chunk_tiles
+
+
+def test_collision_grid_and_chunks_match_the_tiles(level_path):
+    level_map = load_map(level_path)
+    terrain = level_map.get_layer_by_name("Terrain")
+
+    # Every terrain tile is solid, and nothing else is
+    assert list(level_map.collision) == [bool(gid) for gid in terrain.gids]
+
+    # Every tile is in the chunk that contains its position, and the chunks don't have empty tiles
+    size = settings.CHUNK_SIZE * settings.TILE_SIZE
+    baked = {(column, row, index) for (column, row), indices in terrain.chunk_tiles.items() for index in indices}
+    assert baked >= {(index % level_map.width * settings.TILE_SIZE // size,
+                      index // level_map.width * settings.TILE_SIZE // size, index)
+                     for index, gid in enumerate(terrain.gids) if gid}
+    assert all(terrain.gids[index] for column, row, index in baked)
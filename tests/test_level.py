@@ -0,0 +1,150 @@
+import pytest
+import pygame
+from pygame.math import Vector2 as vector
+
+from main import Game
+from src.level import Level
+from src.enemies import SpikeBall
+from src.settings import settings
+from src.timer import scheduler
+from src.animation import animation_clocks
+
+
+@pytest.mark.parametrize("level_num", range(6))
+def test_level_draws_a_frame(game, level_num):
+    """Every level builds, updates and draws its first frame"""
+    level = Level(game.maps.get(level_num), game.level_frames, game.data, lambda *args: None, game.sounds)
+
+    level.update(1 / settings.SIMULATION_RATE)
+    level.draw(0.5, 1 / settings.SIMULATION_RATE)
+
+    # The player is in the part of the level that the camera sees
+    camera_rect = level.surface.get_frect(topleft=-level.sprites.offset)
+    assert camera_rect.colliderect(level.player.hitbox_rect)
+
+
+def test_simulation_does_not_depend_on_drawing():
+    """A headless simulation updates the same sprites as a drawn one, so the player ends in the same place"""
+    simulated = Game(headless=True, seed=0)
+    simulated.simulate(4)
+
+    drawn = Game(headless=True, seed=0)
+    for step_num in range(4 * settings.SIMULATION_RATE):
+        drawn._step(1 / settings.SIMULATION_RATE)
+        drawn.current_level.draw(1, 1 / settings.SIMULATION_RATE)
+
+    # The moving platform carries the player through the level in both of them
+    assert isinstance(simulated.current_level, Level) and isinstance(drawn.current_level, Level)
+    assert simulated.current_level.player.hitbox_rect.topleft == drawn.current_level.player.hitbox_rect.topleft
+    assert simulated.data.health == drawn.data.health
+
+
+def test_spike_chain_moves_in_the_grid_with_its_ball(game):
+    """Chain links are stored like static sprites, the spike ball moves them between the cells"""
+    level = Level(game.maps.get(0), game.level_frames, game.data, lambda *args: None, game.sounds)
+    ball = next(sprite for sprite in level.sprites if isinstance(sprite, SpikeBall))
+    for step_num in range(settings.SIMULATION_RATE):
+        level.update(1 / settings.SIMULATION_RATE)
+
+    layer = level.sprites.layers[settings.LAYERS_DEPTH["bg_details"]]
+    assert not any(link in layer.dynamic for link in ball.chain)
+    assert all(link in layer.query(link.rect) for link in ball.chain)
+
+
+def test_entered_level_uses_the_prepared_tiles():
+    """Tiles of the prefetched level are baked between frames, the level only takes them"""
+    game = Game(headless=True, seed=0)
+    game._prefetch(1)
+    game.maps.get(1)
+    while not game.baker or game.baker.waiting:
+        game._prepare()
+    chunks = game.baker.chunks
+
+    game.data.level = 1
+    game._switch_level("level")
+
+    assert game.current_level.sprites.chunks == chunks
+    assert all(game.current_level.sprites.chunks[depth] is chunks[depth] for depth in chunks)
+    assert game.baker is None and game.preparing is None
+
+
+def test_camera_offset_is_snapped_to_whole_pixels(game):
+    """Chunks and sprites are drawn with the same whole-pixel offset, so they don't drift apart"""
+    level = Level(game.maps.get(3), game.level_frames, game.data, lambda *args: None, game.sounds)
+    level.sprites.last_camera.update(-81.62, -10.3)
+    level.sprites.camera.update(-84.9, -12.6)
+
+    level.draw(0.37, 1 / settings.SIMULATION_RATE)
+
+    assert level.sprites.offset.x == int(level.sprites.offset.x)
+    assert level.sprites.offset.y == int(level.sprites.offset.y)
+
+
+def test_chunks_are_cut_to_the_level(game):
+    """Level 0 is 20 tiles tall, so its bottom chunks are shorter than the others"""
+    level = Level(game.maps.get(0), game.level_frames, game.data, lambda *args: None, game.sounds)
+
+    for chunks in level.sprites.chunks.values():
+        for (column, row), chunk in chunks.chunks.items():
+            assert chunk.get_width() <= chunks.size and column * chunks.size + chunk.get_width() <= level.width
+            assert chunk.get_height() <= chunks.size and row * chunks.size + chunk.get_height() <= level.bottom
+
+
+def test_large_clouds_move_only_in_the_simulation(game):
+    """Drawing doesn't move the large clouds, so a headless level has them in the same place"""
+    level = Level(game.maps.get(0), game.level_frames, game.data, lambda *args: None, game.sounds)
+    assert level.sprites.sky
+
+    level.update(1 / settings.SIMULATION_RATE)
+    pos_x = level.sprites.large_cloud_x
+    level.draw(0.5, 1 / settings.SIMULATION_RATE)
+    level.draw(1, 1 / settings.SIMULATION_RATE)
+
+    assert pos_x == level.sprites.large_cloud_x == -level.sprites.large_cloud_speed / settings.SIMULATION_RATE
+
+
+def test_spike_ball_sleeps_with_its_chain(game):
+    """A spike ball is active while the area its chain reaches is near the camera, otherwise it catches up later"""
+    level = Level(game.maps.get(0), game.level_frames, game.data, lambda *args: None, game.sounds)
+    ball = next(sprite for sprite in level.sprites if isinstance(sprite, SpikeBall))
+    delta_time = 1 / settings.SIMULATION_RATE
+
+    # Put the camera just next to the area of the spike ball, away from the ball itself
+    ball.angle = ball.start_angle
+    ball._set_pos()
+    window = pygame.FRect(0, 0, settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+    window.inflate_ip(settings.ACTIVITY_MARGIN * 2, settings.ACTIVITY_MARGIN * 2)
+    window.topright = (ball.activity_rect.left + 1, ball.activity_rect.top)
+    level.sprites.camera.update(-window.left - settings.ACTIVITY_MARGIN, -window.top - settings.ACTIVITY_MARGIN)
+    assert not window.colliderect(ball.rect)
+
+    angle = ball.angle
+    level.sprites.update(delta_time)
+    assert ball.angle != angle
+
+    # Move the camera far away, the spike ball and its chain sleep
+    level.sprites.camera.update(-window.left - settings.ACTIVITY_MARGIN + 10000, 0)
+    angle = ball.angle
+    for step_num in range(30):
+        level.sprites.update(delta_time)
+    assert ball.angle == angle
+
+    # When it wakes up, the angle moves on and the whole chain is placed with it
+    ball.catch_up(level.sprites.time - level.sprites.update_times[ball])
+    assert ball.angle != angle
+    direction = (vector(ball.rect.center) - ball.center).normalize()
+    for link, radius in zip(ball.chain, ball.chain_radii):
+        assert vector(link.rect.center).distance_to(vector(ball.center) + direction * radius) < 0.01
+
+
+def test_headless_games_do_not_share_timers_or_animations():
+    """A new game starts on its own clock, without the timers and the animation clocks of an earlier one"""
+    earlier = Game(headless=True, seed=0)
+    earlier.simulate(2)
+    earlier_clocks = list(animation_clocks.clocks.values())
+
+    game = Game(headless=True, seed=0)
+
+    assert scheduler.clock is game.virtual_clock
+    assert all(timer.start_time <= game.virtual_clock() for end_time, order, timer, starts in scheduler.queue)
+    assert not any(clock in animation_clocks.clocks.values() for clock in earlier_clocks)
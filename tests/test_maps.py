@@ -0,0 +1,71 @@
+import time
+import threading
+
+from src.maps import Maps
+
+
+class Loader:
+    """Load function that counts the loaded paths, and can take a while"""
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.paths = []
+        self.threads = []
+
+    def __call__(self, path):
+        time.sleep(self.delay)
+        self.paths.append(path)
+        self.threads.append(threading.current_thread())
+        return {"path": path}
+
+
+def test_maps_are_loaded_when_needed_and_kept():
+    load = Loader()
+    maps = Maps({"a": "a.tmx", "b": "b.tmx"}, 2, load)
+    assert load.paths == []
+
+    first = maps.get("a")
+    assert maps.get("a") is first
+    assert load.paths == ["a.tmx"]
+    assert maps.stats()["hits"] == 1 and maps.stats()["misses"] == 1
+
+
+def test_least_recently_used_map_is_forgotten():
+    load = Loader()
+    maps = Maps({"a": "a.tmx", "b": "b.tmx", "c": "c.tmx"}, 2, load)
+
+    maps.get("a")
+    maps.get("b")
+    maps.get("a")
+    maps.get("c")
+    maps.get("b")
+
+    assert load.paths == ["a.tmx", "b.tmx", "c.tmx", "b.tmx"]
+    assert list(maps.cache) == ["c", "b"]
+
+
+def test_get_waits_for_the_prefetched_map():
+    load = Loader(0.05)
+    maps = Maps({"a": "a.tmx"}, 2, load)
+
+    maps.prefetch("a")
+    maps.prefetch("a")
+    assert not maps.loaded("a")
+    level_map = maps.get("a")
+
+    # The map was loaded only once, in the background
+    assert level_map == {"path": "a.tmx"}
+    assert load.paths == ["a.tmx"]
+    assert load.threads[0] is not threading.main_thread()
+    assert maps.loaded("a") and not maps.loading
+    assert maps.stats()["prefetches"] == 1 and maps.stats()["hits"] == 1 and maps.stats()["misses"] == 0
+
+
+def test_loaded_map_is_not_prefetched():
+    load = Loader()
+    maps = Maps({"a": "a.tmx"}, 2, load)
+
+    maps.get("a")
+    maps.prefetch("a")
+
+    assert maps.stats()["prefetches"] == 0
+    assert load.paths == ["a.tmx"]
@@ -0,0 +1,29 @@
+from src.overworld import OverWorld
+
+
+def test_overworld_draws_a_frame(game):
+    """The overworld updates and draws its first frame, with static and moving main objects"""
+    overworld = OverWorld(game.maps.get("overworld"), game.data, game.overworld_frames, game._switch_level,
+                          game.maps.prefetch)
+
+    overworld.update(1 / 60)
+    overworld.draw(0.5, 1 / 60)
+
+    # Palms and the icon are drawn together, in order of their vertical position
+    assert overworld.icon in overworld.sprites.main_sprites
+    assert len(overworld.sprites.main_sprites) > 1
+
+
+def test_overworld_prepares_the_level_of_the_icon(game):
+    """The level prepared when the overworld opens is the one at the node where the icon stands"""
+    prefetched = []
+    level = game.data.level
+    game.data.level = 2
+    try:
+        overworld = OverWorld(game.maps.get("overworld"), game.data, game.overworld_frames, game._switch_level,
+                              prefetched.append)
+    finally:
+        game.data.level = level
+
+    assert prefetched == [2]
+    assert overworld.icon.rect.colliderect(overworld.node.rect)
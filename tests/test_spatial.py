@@ -0,0 +1,69 @@
+import pygame
+
+from src.spatial import SpatialGrid
+
+
+class Box(pygame.sprite.Sprite):
+    """Sprite that has only a rectangle"""
+    def __init__(self, pos, size=(64, 64), dynamic=False):
+        super().__init__()
+        self.rect = pygame.FRect(pos, size)
+        self.dynamic = dynamic
+
+
+def test_query_returns_nearby_sprites_in_order_of_adding():
+    grid = SpatialGrid(64)
+    far = Box((1000, 1000))
+    second = Box((64, 0))
+    first = Box((0, 0))
+    for sprite in (far, second, first):
+        grid.add(sprite)
+
+    assert grid.query(pygame.FRect(0, 0, 100, 10)) == [second, first]
+    assert len(grid) == 3
+
+
+def test_large_sprite_is_found_in_every_cell_once():
+    grid = SpatialGrid(64)
+    wide = Box((0, 0), (640, 64))
+    grid.add(wide)
+
+    assert grid.query(pygame.FRect(300, 10, 10, 10)) == [wide]
+    assert grid.query(pygame.FRect(0, 0, 640, 64)) == [wide]
+
+
+def test_dynamic_sprites_are_found_where_they_are_now():
+    grid = SpatialGrid(64)
+    moving = Box((0, 0), dynamic=True)
+    grid.add(moving)
+
+    moving.rect.topleft = (500, 500)
+    assert grid.query(pygame.FRect(0, 0, 64, 64)) == []
+    assert grid.query(pygame.FRect(480, 480, 64, 64)) == [moving]
+
+
+def test_moved_static_sprite_leaves_its_old_cells():
+    grid = SpatialGrid(64)
+    carried = Box((0, 0))
+    grid.add(carried)
+
+    carried.rect.topleft = (500, 500)
+    grid.move(carried)
+
+    assert grid.query(pygame.FRect(0, 0, 64, 64)) == []
+    assert grid.query(pygame.FRect(480, 480, 64, 64)) == [carried]
+    assert not grid.dynamic
+
+
+def test_removed_sprites_are_not_found():
+    grid = SpatialGrid(64)
+    static = Box((0, 0))
+    moving = Box((0, 0), dynamic=True)
+    grid.add(static)
+    grid.add(moving)
+
+    grid.remove(static)
+    grid.remove(moving)
+
+    assert grid.query(pygame.FRect(0, 0, 64, 64)) == []
+    assert len(grid) == 0